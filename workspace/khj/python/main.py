@@ -1,24 +1,67 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import pandas as pd
 import joblib
+import os
+import time
 
 from food_recommender import (
     filter_processed,
     map_deficit_to_cluster
 )
 
-app = FastAPI()
-
 # ------------------------------------------------------------
-# 1. 음식 DB + 모델 로드
+# 1. 음식 DB + 모델 로드 (lifespan 에서 로드 후 warm-up)
 # ------------------------------------------------------------
-try:
-    df_food = pd.read_csv("food_clustered.csv")
-    model = joblib.load("food_recommend_model.pkl")
-    print("모델 로드 완료: food_recommend_model.pkl")
-except:
-    raise Exception("food_clustered.csv 또는 food_recommend_model.pkl 파일을 찾을 수 없습니다.")
+WARMUP_RUNS = int(os.getenv("RECOMMEND_WARMUP_RUNS", 3))
+
+df_food = None
+model = None
+
+# /health/ready 에서 반환하는 모델별 로드 상태
+model_status = {
+    "food_clustered": {"state": "loading"},
+    "food_recommend_model": {"state": "loading"},
+}
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def load_models():
+    global df_food, model
+
+    try:
+        df_food, csv_ms = _timed(lambda: pd.read_csv("food_clustered.csv"))
+        model, model_ms = _timed(lambda: joblib.load("food_recommend_model.pkl"))
+        print("모델 로드 완료: food_recommend_model.pkl")
+    except Exception:
+        raise Exception("food_clustered.csv 또는 food_recommend_model.pkl 파일을 찾을 수 없습니다.")
+
+    # 합성 입력으로 추천 경로(필터링 + 클러스터 조회)와 KMeans 예측을 미리 실행
+    goal = {"goal_calories": 2000, "goal_carbs": 300, "goal_protein": 60, "goal_fat": 50}
+    current = {"calories": 0, "carbs": 0, "protein": 0, "fat": 0, "fiber": 0, "sodium": 0}
+    _, recommend_ms = _timed(lambda: [recommend_menu(goal, current, df_food) for _ in range(WARMUP_RUNS)])
+
+    sample = [[0.0] * model.n_features_in_]
+    _, kmeans_ms = _timed(lambda: [model.predict(sample) for _ in range(WARMUP_RUNS)])
+
+    model_status["food_clustered"] = {"state": "ready", "load_ms": csv_ms, "warmup_ms": recommend_ms, "warmup_runs": WARMUP_RUNS}
+    model_status["food_recommend_model"] = {"state": "ready", "load_ms": model_ms, "warmup_ms": kmeans_ms, "warmup_runs": WARMUP_RUNS}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_models()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # ------------------------------------------------------------
@@ -111,6 +154,15 @@ def recommend_menu(goal, current, df):
 # ------------------------------------------------------------
 # 5. FastAPI 엔드포인트
 # ------------------------------------------------------------
+@app.get("/health/ready")
+def health_ready():
+    ready = all(status["state"] == "ready" for status in model_status.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": model_status},
+    )
+
+
 @app.post("/diet/recommend")
 def recommend(request: RecommendRequest):
 
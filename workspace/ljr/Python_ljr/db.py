@@ -1,12 +1,21 @@
 import pymysql
+import os
 
-def get_connection():
-    return pymysql.connect(
-        host="3.37.90.119",
-        user="root",
-        password="3306",
-        database="saveus",
+# 커넥션 풀은 공용 패키지 saveus_common 사용 (pip install -e ../../saveus_common)
+from saveus_common.db_pool import ConnectionPool
+
+connection_pool = ConnectionPool(
+    lambda: pymysql.connect(
+        host=os.getenv("DB_HOST", "3.37.90.119"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", "3306"),
+        database=os.getenv("DB_DATABASE", "saveus"),
+        port=int(os.getenv("DB_PORT", 3306)),
         charset="utf8mb4",
         cursorclass=pymysql.cursors.DictCursor
     )
+)
 
+def get_connection():
+    # 매 요청마다 새로 연결하지 않고 풀에서 빌림 (close() 하면 풀에 반납)
+    return connection_pool.get_connection()
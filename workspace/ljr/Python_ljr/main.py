@@ -1,7 +1,15 @@
-from fastapi import FastAPI
-from db import get_connection
+from typing import List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from db import connection_pool
+from rollup import fetch_user_rollups, rollup_cache
 import numpy as np
 import joblib
+import os
+
+# 배치 예측 한 번에 받을 수 있는 최대 유저 수
+PREDICT_BATCH_MAX_USERS = int(os.getenv("PREDICT_BATCH_MAX_USERS", 10000))
 
 
 app = FastAPI()
@@ -9,67 +17,39 @@ app = FastAPI()
 
 # 1) 유저 기본정보 조회
 def get_user_base(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
-
-    sql = """
-        SELECT 
-            USER_ID,
-            AGE,
-            GENDER,
-            HEIGHT,
-            CURRENT_WEIGHT
-        FROM USERS
-        WHERE USER_ID = %s
-    """
-
-    cur.execute(sql, (user_id,))
-    result = cur.fetchone()
-
-    cur.close()
-    conn.close()
-    return result
+    return rollup_cache.get(user_id)[0]
 
 
 
 # 2) 유저 오늘 영양 섭취 합계 조회
 def get_today_nutrition(user_id):
-    conn = get_connection()
-    cur = conn.cursor()
-
-    sql = """
-        SELECT
-            IFNULL(SUM(CALORIES_KCAL), 0) AS total_calories,
-            IFNULL(SUM(CARBS_G), 0) AS total_carbs,
-            IFNULL(SUM(PROTEIN_G), 0) AS total_protein,
-            IFNULL(SUM(FATS_G), 0) AS total_fat,
-            IFNULL(SUM(SUGAR_G), 0) AS total_sugar,
-            IFNULL(SUM(FIBER_G), 0) AS total_fiber,
-            IFNULL(SUM(CALCIUM_MG), 0) AS total_calcium,
-            IFNULL(SUM(SODIUM_MG), 0) AS total_sodium
-        FROM MEAL_ENTRY
-        WHERE USER_ID = %s
-        AND DATE(EAT_TIME) = CURDATE()
-    """
-
-    cur.execute(sql, (user_id,))
-    result = cur.fetchone()
-
-    cur.close()
-    conn.close()
-    return result
+    return rollup_cache.get(user_id)[1]
 
 # 3) 테스트용 API
 @app.get("/user-data/{user_id}")
 def user_data(user_id: int):
-    base = get_user_base(user_id)
-    nutrition = get_today_nutrition(user_id)
+    # 기본정보와 오늘 영양 합계를 한 번의 쿼리(또는 캐시)로 조회
+    base, nutrition = rollup_cache.get(user_id)
 
     return {
         "user": base,
         "today_nutrition": nutrition
     }
 
+# 식단이 추가/수정되면 호출해 해당 유저(또는 전체)의 캐시를 무효화
+@app.post("/rollup/invalidate/{user_id}")
+def invalidate_rollup(user_id: int):
+    return {"invalidated": rollup_cache.invalidate(user_id)}
+
+@app.post("/rollup/invalidate")
+def invalidate_all_rollups():
+    return {"invalidated": rollup_cache.invalidate()}
+
+# 커넥션 풀 / 쿼리 시간 / 롤업 캐시 통계
+@app.get("/db-stats")
+def db_stats():
+    return {**connection_pool.stats(), "rollup": rollup_cache.stats()}
+
 # 모델 및 스케일러 로드
 model = joblib.load("obesity_model.pkl")
 scaler = joblib.load("scaler.pkl")
@@ -96,10 +76,21 @@ def make_input_vector(base, nutrition):
         total_sugar, total_fiber, total_calcium, total_sodium
     ]])
 
+# 여러 유저의 입력벡터를 한 번에 (n x 12) 행렬로 변환
+def make_input_matrix(rows):
+    return np.array([make_input_vector(base, nutrition)[0] for base, nutrition in rows], dtype=float)
+
+# 스케일링과 예측을 한 번에 실행. 클래스는 predict_proba 결과에서 구해 모델을 한 번만 호출
+def predict_matrix(x):
+    x_scaled = scaler.transform(x)
+    proba = model.predict_proba(x_scaled)
+    pred = model.classes_[np.argmax(proba, axis=1)]
+    return pred, proba[:, 1] #비만일 확률
+
 @app.get("/predict-obesity/{user_id}")
 def predict_obesity(user_id: int):
-    base = get_user_base(user_id)
-    nutrition = get_today_nutrition(user_id)
+    # 기본정보와 오늘 영양 합계를 한 번의 쿼리(또는 캐시)로 조회
+    base, nutrition = rollup_cache.get(user_id)
 
     if base is None:
         return {"error": "유저ID를 찾을 수 없습니다."}
@@ -110,16 +101,46 @@ def predict_obesity(user_id: int):
     # 입력벡터 생성
     x = make_input_vector(base, nutrition)
 
-    # 스케일링 적용
-    x_scaled = scaler.transform(x)
-
-    # 예측 실행
-    pred = model.predict(x_scaled)[0]
-    prob = model.predict_proba(x_scaled)[0][1] #비만일 확률
+    # 스케일링 + 예측 실행
+    pred, prob = predict_matrix(x)
+    pred, prob = pred[0], prob[0]
 
     # 브라우저로 JSON 반환
     return {
         "user_id": user_id,
         "obesity": int(pred),
         "probability": float(prob) * 100
-    }
\ No newline at end of file
+    }
+
+
+class BatchPredictRequest(BaseModel):
+    user_ids: List[int]
+
+@app.post("/predict-obesity/batch")
+def predict_obesity_batch(request: BatchPredictRequest):
+    if len(request.user_ids) > PREDICT_BATCH_MAX_USERS:
+        raise HTTPException(status_code=400, detail=f"유저는 최대 {PREDICT_BATCH_MAX_USERS}명까지 가능")
+
+    # 기본정보 + 오늘 영양 합계를 묶음 쿼리로 조회
+    rollups = fetch_user_rollups(request.user_ids)
+    found_ids = [user_id for user_id in dict.fromkeys(request.user_ids) if user_id in rollups]
+
+    results = {}
+    if found_ids:
+        # 하나의 행렬로 만들어 스케일링 / 예측을 한 번만 실행
+        x = make_input_matrix([rollups[user_id] for user_id in found_ids])
+        preds, probs = predict_matrix(x)
+
+        for user_id, pred, prob in zip(found_ids, preds, probs):
+            results[user_id] = {
+                "user_id": user_id,
+                "obesity": int(pred),
+                "probability": float(prob) * 100
+            }
+
+    return {
+        "results": [
+            results.get(user_id) or {"user_id": user_id, "error": "유저ID를 찾을 수 없습니다."}
+            for user_id in request.user_ids
+        ]
+    }
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from datetime import date
+
+from db import get_connection
+
+import os
+import threading
+import time
+
+# (유저, 날짜) 별 기본정보 + 오늘 영양 합계 캐시 유지 시간 (초). 식단 입력 시에는 invalidate 로 바로 무효화
+ROLLUP_TTL_SEC = float(os.getenv("ROLLUP_TTL_SEC", 30))
+# 캐시에 두는 최대 유저 수. 넘으면 가장 오래 조회되지 않은 항목부터 제거 (LRU)
+ROLLUP_CACHE_MAX_ENTRIES = int(os.getenv("ROLLUP_CACHE_MAX_ENTRIES", 10000))
+
+NUTRITION_KEYS = (
+    "total_calories",
+    "total_carbs",
+    "total_protein",
+    "total_fat",
+    "total_sugar",
+    "total_fiber",
+    "total_calcium",
+    "total_sodium",
+)
+
+ROLLUP_BATCH_CHUNK = int(os.getenv("ROLLUP_BATCH_CHUNK", 1000))
+
+# DATE(EAT_TIME) 대신 범위 조건을 써서 MEAL_ENTRY (USER_ID, EAT_TIME) 인덱스를 탈 수 있도록 함
+# 날짜는 CURDATE() 가 아니라 파라미터로 받아 캐시 키의 날짜와 항상 같게 함 (앱 / DB 시간대가 달라도 일치)
+ROLLUP_SQL = """
+    SELECT
+        U.USER_ID,
+        U.AGE,
+        U.GENDER,
+        U.HEIGHT,
+        U.CURRENT_WEIGHT,
+        IFNULL(SUM(M.CALORIES_KCAL), 0) AS total_calories,
+        IFNULL(SUM(M.CARBS_G), 0) AS total_carbs,
+        IFNULL(SUM(M.PROTEIN_G), 0) AS total_protein,
+        IFNULL(SUM(M.FATS_G), 0) AS total_fat,
+        IFNULL(SUM(M.SUGAR_G), 0) AS total_sugar,
+        IFNULL(SUM(M.FIBER_G), 0) AS total_fiber,
+        IFNULL(SUM(M.CALCIUM_MG), 0) AS total_calcium,
+        IFNULL(SUM(M.SODIUM_MG), 0) AS total_sodium
+    FROM USERS U
+    LEFT JOIN MEAL_ENTRY M
+        ON M.USER_ID = U.USER_ID
+        AND M.EAT_TIME >= %s
+        AND M.EAT_TIME < %s + INTERVAL 1 DAY
+    WHERE U.USER_ID {user_filter}
+    GROUP BY U.USER_ID, U.AGE, U.GENDER, U.HEIGHT, U.CURRENT_WEIGHT
+"""
+
+
+def split_rollup_row(row):
+    # 한 행을 기존 get_user_base / get_today_nutrition 결과 형태로 나눈다
+    if row is None:
+        return None, {key: 0 for key in NUTRITION_KEYS}
+
+    base = {key: value for key, value in row.items() if key not in NUTRITION_KEYS}
+    nutrition = {key: row[key] for key in NUTRITION_KEYS}
+    return base, nutrition
+
+
+def fetch_user_rollup(user_id, day=None):
+    day = day or date.today()
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute(ROLLUP_SQL.format(user_filter="= %s"), (day, day, user_id))
+    row = cur.fetchone()
+
+    cur.close()
+    conn.close()
+    return split_rollup_row(row)
+
+
+def fetch_user_rollups(user_ids, chunk_size=ROLLUP_BATCH_CHUNK, day=None):
+    # 여러 유저를 IN + GROUP BY 로 묶어 조회. 없는 유저는 결과에서 빠진다
+    day = day or date.today()
+    user_ids = list(dict.fromkeys(user_ids))
+    rollups = {}
+
+    conn = get_connection()
+    cur = conn.cursor()
+
+    for i in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[i:i + chunk_size]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cur.execute(ROLLUP_SQL.format(user_filter=f"IN ({placeholders})"), (day, day, *chunk))
+        for row in cur.fetchall():
+            rollups[row["USER_ID"]] = split_rollup_row(row)
+
+    cur.close()
+    conn.close()
+    return rollups
+
+
+class RollupCache:
+    def __init__(self, ttl=ROLLUP_TTL_SEC, max_entries=ROLLUP_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._day = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id):
+        key = (user_id, date.today())
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        # 캐시 키와 같은 날짜로 조회
+        value = fetch_user_rollup(user_id, key[1])
+
+        with self._lock:
+            # 조회 중에 무효화됐다면 이전 데이터일 수 있으므로 저장하지 않음
+            if generation != self._generation:
+                return value
+            # 날짜가 바뀌면 전날 항목은 더 이상 조회되지 않으므로 정리
+            if self._day != key[1]:
+                self._entries = OrderedDict((k, v) for k, v in self._entries.items() if k[1] == key[1])
+                self._day = key[1]
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [k for k in self._entries if k[0] == user_id]
+                for k in keys:
+                    del self._entries[k]
+                removed = len(keys)
+        return removed
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl,
+        }
+
+
+rollup_cache = RollupCache()
@@ -1,15 +1,31 @@
-from typing import Optional
+from typing import Optional, List, Iterable
 import mysql.connector
+import os
+
+# 커넥션 풀은 공용 패키지 saveus_common 사용 (pip install -e ../saveus_common)
+from saveus_common.db_pool import ConnectionPool
+
+# 조회마다 새로 연결하지 않고 풀에서 빌려 씀 (close() 하면 풀에 반납)
+connection_pool = ConnectionPool(
+    lambda: mysql.connector.connect(
+        host=os.getenv("DB_HOST", "3.37.90.119"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", "3306"),
+        database=os.getenv("DB_DATABASE", "saveus"),
+        port=int(os.getenv("DB_PORT", 3306)),
+        charset="utf8"
+    )
+)
+
+
+def get_connection():
+    return connection_pool.get_connection()
+
 
 def get_food_nutrition_by_name(food_name: str) -> Optional[dict]:
+    conn = cursor = None
     try:
-        conn = mysql.connector.connect(
-            host="3.37.90.119",
-            user="root",
-            password="3306",
-            database="saveus",
-            charset="utf8"
-        )
+        conn = get_connection()
         cursor = conn.cursor()
 
         query = """
@@ -36,7 +52,43 @@ def get_food_nutrition_by_name(food_name: str) -> Optional[dict]:
             conn.close()
 
 
+def get_food_nutrition_by_names(food_names: Iterable[Optional[str]]) -> List[Optional[dict]]:
+    # 여러 음식명을 한 번의 IN 쿼리로 조회 (입력과 같은 위치에 결과, 없는 이름은 None)
+    food_names = list(food_names)
+    unique_names = list(dict.fromkeys(name for name in food_names if name))
+    rows_by_name = {}
+
+    conn = cursor = None
+    try:
+        if unique_names:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            placeholders = ", ".join(["%s"] * len(unique_names))
+            query = f"""
+            SELECT * FROM FOOD_NUTRITION
+            WHERE FOOD_NAME IN ({placeholders})
+            """
+
+            cursor.execute(query, tuple(unique_names))
+            columns = [desc[0].lower() for desc in cursor.description]
+            for row in cursor.fetchall():
+                food_info = dict(zip(columns, row))
+                rows_by_name.setdefault(food_info["food_name"].casefold().rstrip(), food_info)
+
+    except Exception as e:
+        print("MySQL ERROR:", e)
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+    return [rows_by_name.get(name.casefold().rstrip()) if name else None for name in food_names]
+
+
 if __name__ == "__main__":
     print(get_food_nutrition_by_name("고구마"))
     print(get_food_nutrition_by_name("김밥"))
     print(get_food_nutrition_by_name(""))
+    print(get_food_nutrition_by_names(["고구마", "김밥", ""]))
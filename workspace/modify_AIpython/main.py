@@ -4,9 +4,10 @@ from fastapi import FastAPI, File, UploadFile, HTTPException
 from pydantic import BaseModel
 from starlette.middleware.cors import CORSMiddleware
 
-from food_nutrition_repository_mysql import get_food_nutrition_by_name
-from yolo_inference import detect_objects
+from food_nutrition_repository_mysql import get_food_nutrition_by_names, connection_pool
+from yolo_inference import detect_objects, batch_engine
 from label_mapper import label_map
+from saveus_common.image_ingest import ImageIngestError, read_upload
 
 app = FastAPI()
 
@@ -37,21 +38,20 @@ async def api_test(file: UploadFile = File(...)):
     if file is None:
         raise HTTPException(status_code=400, detail="파일 없음")
 
-    if file.content_type not in ["image/png", "image/jpeg"]:
-        raise HTTPException(status_code=400, detail="잘못된 파일 유형")
-
-    content = await file.read()
-
-    if len(content) == 0:
-        raise HTTPException(status_code=400, detail="빈 파일")
+    # chunk 단위로 읽으며 크기 / 매직 바이트 / 해상도 검사 (content_type 은 신뢰하지 않음)
+    try:
+        content = await read_upload(file.read, size_hint=file.size)
+    except ImageIngestError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
 
     detection_res = await detect_objects(content)
     items = [label_map.get(res) for res in detection_res]
-    nutrition_items = [
-        FoodItem(**food_info)
-        for item in items
-        if (food_info := get_food_nutrition_by_name(item))
-    ]
+    # 감지된 음식들을 한 번의 쿼리로 조회
+    food_infos = get_food_nutrition_by_names(items)
+    nutrition_items = [FoodItem(**food_info) for food_info in food_infos if food_info is not None]
+
+    if misses := [item for item, food_info in zip(items, food_infos) if food_info is None]:
+        print("NUTRITION MISS:", misses)
 
     print("YOLO DETECT:", detection_res)
 
@@ -60,6 +60,14 @@ async def api_test(file: UploadFile = File(...)):
     }
 
 
+@app.get("/api_test/stats")
+async def api_test_stats():
+    return {
+        "batching": batch_engine.stats.snapshot(),
+        "db": connection_pool.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
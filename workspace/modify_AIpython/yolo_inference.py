@@ -1,18 +1,22 @@
+from typing import List
+
 from six import BytesIO
 from ultralytics import YOLO
 from collections import Counter
 from PIL import Image
 
+from saveus_common.batching import BatchInferenceEngine
+
+import os
+
 # YOLO 모델 로드
 model = YOLO("saveUs_food_detection.pt")
 
-async def detect_objects(content: bytes) -> Counter:
-    # 이미지 열기
-    img = Image.open(BytesIO(content))
+# 이보다 큰 JPEG 는 축소 디코딩 (YOLO 입력은 어차피 640 으로 리사이즈됨)
+IMAGE_MAX_SIDE = int(os.getenv("IMAGE_MAX_SIDE", 1920))
 
-    # YOLO 추론
-    pred = model.predict(img, verbose=False)[0]
 
+def _to_counter(pred) -> Counter:
     # 감지된 박스가 없으면 빈 결과 반환
     if pred.boxes is None or pred.boxes.cls is None:
         return Counter()
@@ -27,6 +31,30 @@ async def detect_objects(content: bytes) -> Counter:
     return Counter(labels)
 
 
+def predict_batch(images: List[Image.Image]) -> List[Counter]:
+    # 모인 이미지들을 한 번의 YOLO 추론으로 처리
+    preds = model.predict(images, verbose=False)
+
+    return [_to_counter(pred) for pred in preds]
+
+
+# 동시 요청을 모아 배치 추론 (YOLO_BATCH_MAX_SIZE=1 이면 요청마다 단건 추론)
+batch_engine = BatchInferenceEngine(
+    predict_batch,
+    max_batch_size=int(os.getenv("YOLO_BATCH_MAX_SIZE", 8)),
+    max_wait_ms=float(os.getenv("YOLO_BATCH_MAX_WAIT_MS", 5)),
+)
+
+
+async def detect_objects(content: bytes) -> Counter:
+    # 이미지 열기
+    img = Image.open(BytesIO(content))
+    img.draft("RGB", (IMAGE_MAX_SIDE, IMAGE_MAX_SIDE))
+
+    # 배치 엔진에 제출 후 결과 대기
+    return await batch_engine.submit(img)
+
+
 if __name__ == "__main__":
     img = Image.open("sample.jpg")
     result = model.predict(img)[0]
@@ -0,0 +1,141 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from collections import deque
+
+from saveus_common.timings import percentile
+
+import asyncio
+import time
+
+
+class BatchStats:
+    def __init__(self, window: int = 1000) -> None:
+        self.batches = 0
+        self.items = 0
+        self.size_histogram: Dict[int, int] = {}
+        self._waits = deque(maxlen=window)
+        self._max_wait = 0.0
+
+    def record(self, size: int, waits: List[float]) -> None:
+        self.batches += 1
+        self.items += size
+        self.size_histogram[size] = self.size_histogram.get(size, 0) + 1
+        self._waits.extend(waits)
+        self._max_wait = max(self._max_wait, *waits)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.size_histogram.items())),
+            "queue_wait_ms": {
+                "mean": sum(waits) / len(waits) * 1000 if waits else 0.0,
+                "p50": percentile(waits, 0.50) * 1000,
+                "p95": percentile(waits, 0.95) * 1000,
+                "p99": percentile(waits, 0.99) * 1000,
+                "max": self._max_wait * 1000,
+            },
+        }
+
+
+class BatchInferenceEngine:
+    """
+    동시에 들어온 요청을 max_wait_ms 동안 모아 한 번의 배치 추론으로 처리한다.
+    predict_batch 는 입력 리스트를 받아 같은 순서의 결과 리스트를 반환해야 한다.
+    runner 를 넘기면 predict_batch 를 해당 실행기(스레드/프로세스)에서 실행하며,
+    max_concurrent_batches 개의 배치까지 동시에 처리한다.
+    """
+
+    def __init__(
+            self,
+            predict_batch: Callable[[List[Any]], List[Any]],
+            max_batch_size: int = 8,
+            max_wait_ms: float = 5.0,
+            runner: Optional[Callable[..., Awaitable[Any]]] = None,
+            max_concurrent_batches: int = 1,
+    ) -> None:
+        self._predict_batch = predict_batch
+        self._runner = runner
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.max_concurrent_batches = max(1, int(max_concurrent_batches))
+        self.stats = BatchStats()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # 대기 중 취소된 요청은 추론에서 제외
+        return [entry for entry in batch if not entry[1].cancelled()]
+
+    async def _run(self) -> None:
+        while True:
+            # 실행 슬롯이 빌 때까지 요청은 큐에 쌓이므로, 부하가 높을수록 배치가 커진다
+            await self._slots.acquire()
+            batch = await self._collect()
+            if not batch:
+                self._slots.release()
+                continue
+
+            started = time.perf_counter()
+            self.stats.record(len(batch), [started - queued for _, _, queued in batch])
+
+            if self._runner is None:
+                await self._dispatch(batch)
+            else:
+                task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        items = [item for item, _, _ in batch]
+
+        try:
+            if self._runner is None:
+                results = self._predict_batch(items)
+            else:
+                results = await self._runner(self._predict_batch, items)
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,226 @@
+from typing import Any, Callable, Dict, Optional
+from contextlib import contextmanager
+
+from saveus_common.timings import TimingStats
+
+import os
+import queue
+import threading
+import time
+
+# 드라이버에 상관없이 (pymysql, mysql.connector 등 DB-API 커넥션) 사용하는 커넥션 풀.
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+# 이 시간(초)보다 오래된 커넥션은 꺼낼 때 닫고 새로 연결 (MySQL wait_timeout 보다 짧게)
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME_SEC", 1800))
+# 이 시간(초) 이상 쉬고 있던 커넥션은 꺼낼 때 SELECT 1 로 확인 (0 이면 매번, 음수면 확인 안 함)
+DB_POOL_PRE_PING_IDLE = float(os.getenv("DB_POOL_PRE_PING_IDLE_SEC", 30))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT_SEC", 10))
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+
+
+class PoolTimeoutError(Exception): pass
+
+
+class _PoolEntry:
+    __slots__ = ("raw", "created_at", "last_used")
+
+    def __init__(self, raw: Any) -> None:
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class TimedCursor:
+    """execute / executemany 시간을 문장 종류(SELECT, INSERT ...)별로 기록하는 커서 래퍼."""
+
+    def __init__(self, cursor: Any, stats: TimingStats, slow_query_ms: float) -> None:
+        self._cursor = cursor
+        self._stats = stats
+        self._slow_query_ms = slow_query_ms
+
+    def _timed(self, method: Callable, sql: str, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stats.record(sql.split(None, 1)[0].upper() if sql.strip() else "?", elapsed)
+            if elapsed * 1000 >= self._slow_query_ms:
+                self._stats.incr("slow_queries")
+                print(f"slow query ({elapsed * 1000:.1f} ms): {' '.join(sql.split())[:200]}")
+
+    def execute(self, sql: str, *args: Any) -> Any:
+        return self._timed(self._cursor.execute, sql, *args)
+
+    def executemany(self, sql: str, *args: Any) -> Any:
+        return self._timed(self._cursor.executemany, sql, *args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self) -> "TimedCursor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._cursor.close()
+
+
+class PooledConnection:
+    """풀에서 빌린 커넥션. close() 는 실제로 닫지 않고 풀에 반납한다."""
+
+    _entry: Optional[_PoolEntry] = None
+
+    def __init__(self, pool: "ConnectionPool", entry: _PoolEntry) -> None:
+        self._pool = pool
+        self._entry: Optional[_PoolEntry] = entry
+
+    @property
+    def raw(self) -> Any:
+        if self._entry is None:
+            raise RuntimeError("connection already returned to pool")
+        return self._entry.raw
+
+    def cursor(self, *args: Any, **kwargs: Any) -> TimedCursor:
+        return TimedCursor(self.raw.cursor(*args, **kwargs), self._pool.query_stats, self._pool.slow_query_ms)
+
+    def close(self) -> None:
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool._release(entry)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(
+            self,
+            connect: Callable[[], Any],
+            size: int = DB_POOL_SIZE,
+            max_lifetime: float = DB_POOL_MAX_LIFETIME,
+            pre_ping_idle: float = DB_POOL_PRE_PING_IDLE,
+            timeout: float = DB_POOL_TIMEOUT,
+            slow_query_ms: float = DB_SLOW_QUERY_MS,
+    ) -> None:
+        self._connect = connect
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.pre_ping_idle = pre_ping_idle
+        self.timeout = timeout
+        self.slow_query_ms = slow_query_ms
+
+        # 커넥션은 처음 필요할 때 연결하고, 최근에 반납된 것부터 재사용 (LIFO)
+        self._idle: "queue.LifoQueue[_PoolEntry]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.query_stats = TimingStats()
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> _PoolEntry:
+        started = time.perf_counter()
+        entry = _PoolEntry(self._connect())
+        self.query_stats.record("connect", time.perf_counter() - started)
+        return entry
+
+    def _discard(self, entry: _PoolEntry, reason: str) -> None:
+        self.query_stats.incr(reason)
+        try:
+            entry.raw.close()
+        except Exception as exc:
+            print(f"error occurred: {exc}")
+
+    def _ping(self, entry: _PoolEntry) -> bool:
+        try:
+            cursor = entry.raw.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self) -> _PoolEntry:
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+
+            now = time.monotonic()
+            if self.max_lifetime > 0 and now - entry.created_at > self.max_lifetime:
+                self._discard(entry, "recycled")
+                continue
+            if 0 <= self.pre_ping_idle <= now - entry.last_used and not self._ping(entry):
+                self._discard(entry, "ping_failed")
+                continue
+
+            return entry
+
+    def get_connection(self) -> PooledConnection:
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            self.query_stats.incr("pool_timeouts")
+            raise PoolTimeoutError(f"no connection available within {self.timeout}s")
+
+        try:
+            entry = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+        self.query_stats.record("acquire", time.perf_counter() - started)
+        return PooledConnection(self, entry)
+
+    @contextmanager
+    def connection(self):
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _release(self, entry: _PoolEntry) -> None:
+        with self._lock:
+            self.in_use -= 1
+        try:
+            # 커밋하지 않은 트랜잭션 / 오래된 읽기 스냅샷을 정리하고 반납
+            entry.raw.rollback()
+            entry.last_used = time.monotonic()
+            self._idle.put_nowait(entry)
+        except Exception:
+            self._discard(entry, "reset_failed")
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(entry, "closed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "idle": self._idle.qsize(),
+            "queries": self.query_stats.snapshot(),
+        }
@@ -0,0 +1,122 @@
+from typing import Awaitable, Callable, Optional, Tuple, Union
+
+import os
+import re
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SOI = b"\xff\xd8\xff"
+
+# SOF0~SOF15 중 DHT(C4), JPG(C8), DAC(CC) 를 제외한 프레임 헤더
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# 길이가 있는 마커 (채움 바이트 0xFF 반복은 마지막 0xFF 에서 매치). 0x00(stuffing), TEM(01), RSTn / SOI(D0~D8) 는 길이가 없음
+JPEG_MARKER_PATTERN = re.compile(rb"\xff([^\x00\x01\xd0-\xd8\xff])")
+
+UPLOAD_MAX_BYTES = int(float(os.getenv("UPLOAD_MAX_MB", 15)) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_KB", 64)) * 1024
+# 디코딩 폭탄 방지: 이 픽셀 수를 넘는 이미지는 디코딩 전에 거절
+IMAGE_MAX_PIXELS = int(float(os.getenv("IMAGE_MAX_MEGAPIXELS", 50)) * 1_000_000)
+
+
+def read_image_size(content: Union[bytes, bytearray, memoryview]) -> Optional[Tuple[str, int, int]]:
+    """헤더만 읽어 (형식, 가로, 세로) 를 반환한다. PNG/JPEG 가 아니면 None."""
+    if isinstance(content, memoryview):
+        content = content.tobytes()
+
+    return scan_image_size(content)[1]
+
+
+def scan_image_size(
+        content: Union[bytes, bytearray],
+        pos: int = 0,
+) -> Tuple[int, Optional[Tuple[str, int, int]]]:
+    """
+    pos 부터 헤더를 이어서 읽어 (다음에 이어서 읽을 위치, (형식, 가로, 세로) 또는 None) 을 반환한다.
+    JPEG 는 마커의 세그먼트 길이를 따라 본문(EXIF / XMP / ICC 등)을 건너뛰므로,
+    업로드 중에는 새로 들어온 부분만 보면 된다.
+    """
+    if content.startswith(PNG_SIGNATURE):
+        if len(content) >= 24 and content[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", content[16:24])
+            return 24, ("png", width, height)
+        return pos, None
+
+    if not content.startswith(JPEG_SOI):
+        return pos, None
+
+    i = max(pos, 2)
+    while (match := JPEG_MARKER_PATTERN.search(content, i)) is not None:
+        i = match.start()
+        # 마커 바로 뒤: 세그먼트 길이(2) 와 SOF 의 정밀도(1), 세로(2), 가로(2)
+        start = match.end()
+        if start + 7 > len(content):
+            return i, None
+
+        if match.group(1)[0] in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", content[start + 3:start + 7])
+            return i, ("jpeg", width, height)
+
+        i = start + struct.unpack(">H", content[start:start + 2])[0]
+
+    # 끝에 남은 0xFF 는 다음 chunk 에서 마커가 될 수 있으므로 그 위치부터 다시 찾음
+    return max(i, len(content) - 1), None
+
+
+class ImageIngestError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_image_type(head: Union[bytes, bytearray]) -> Optional[str]:
+    if head.startswith(PNG_SIGNATURE):
+        return "png"
+    if head.startswith(JPEG_SOI):
+        return "jpeg"
+    return None
+
+
+async def read_upload(
+        read: Callable[[int], Awaitable[bytes]],
+        size_hint: Optional[int] = None,
+        max_bytes: int = UPLOAD_MAX_BYTES,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_pixels: int = IMAGE_MAX_PIXELS,
+) -> bytearray:
+    """
+    업로드를 chunk 단위로 읽으면서 크기 제한, 매직 바이트(PNG/JPEG), 헤더상의 해상도를 검사한다.
+    조건을 벗어나면 나머지를 읽지 않고 ImageIngestError 를 발생시킨다.
+    """
+    if size_hint is not None and size_hint > max_bytes:
+        raise ImageIngestError(413, "파일 크기 초과")
+
+    buf = bytearray()
+    scan_pos = 0
+    checked_size = False
+
+    while chunk := await read(chunk_size):
+        buf += chunk
+
+        if len(buf) > max_bytes:
+            raise ImageIngestError(413, "파일 크기 초과")
+
+        if not checked_size and len(buf) >= len(PNG_SIGNATURE) and sniff_image_type(buf) is None:
+            raise ImageIngestError(400, "잘못된 파일 유형")
+
+        # 지난 chunk 에서 멈춘 위치부터 이어서 헤더를 찾음 (버퍼 전체를 다시 훑지 않음)
+        if not checked_size:
+            scan_pos, info = scan_image_size(buf, scan_pos)
+            if info is not None:
+                checked_size = True
+                _, width, height = info
+                if width * height > max_pixels:
+                    raise ImageIngestError(413, "이미지 해상도 초과")
+
+    if len(buf) == 0:
+        raise ImageIngestError(400, "빈 파일")
+
+    if sniff_image_type(buf) is None or not checked_size:
+        raise ImageIngestError(400, "잘못된 파일 유형")
+
+    return buf
@@ -0,0 +1,58 @@
+from typing import Any, Awaitable, Dict, Iterable, TypeVar
+from collections import deque
+
+import threading
+import time
+
+T = TypeVar("T")
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    # nearest-rank 분위 값. 비어 있으면 0
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class TimingStats:
+    # DB 커넥션 풀처럼 여러 스레드에서 기록해도 되도록 lock 으로 보호
+    def __init__(self, window: int = 1000) -> None:
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._totals: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self._window)).append(seconds)
+            self._totals[name] = self._totals.get(name, 0) + 1
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        result = await awaitable
+        self.record(name, time.perf_counter() - started)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            totals = dict(self._totals)
+            counters = dict(self.counters)
+
+        result: Dict[str, Any] = {}
+        for name, values in samples.items():
+            result[name] = {
+                "count": totals[name],
+                "mean_ms": sum(values) / len(values) * 1000,
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        result["counters"] = counters
+        return result
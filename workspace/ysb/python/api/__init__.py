@@ -1,4 +1,5 @@
 from .food_nutrition_client import FoodNutritionClient
 from .product_info_client import ProductInfoClient
+from .http_pool import HTTPClientPool, http_pool
 
-__all__ = ["FoodNutritionClient", "ProductInfoClient"]
+__all__ = ["FoodNutritionClient", "ProductInfoClient", "HTTPClientPool", "http_pool"]
@@ -3,6 +3,24 @@ from urllib.parse import quote
 
 import httpx
 
+from api.http_pool import http_pool
+
+import asyncio
+import os
+import random
+import time
+
+# 한 번의 fetch 가 재시도 / hedge 를 포함해 쓸 수 있는 전체 시간 (초)
+API_DEADLINE = float(os.getenv("API_DEADLINE_SEC", 10))
+API_RETRIES = int(os.getenv("API_RETRIES", 2))
+API_BACKOFF = float(os.getenv("API_BACKOFF_SEC", 0.2))
+# 첫 요청이 이 시간(초) 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 온 응답을 사용 (0 이면 사용 안 함)
+API_HEDGE_AFTER = float(os.getenv("API_HEDGE_AFTER_SEC", 0))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+api_call_stats: Dict[str, int] = {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0}
+
 
 class APIClient:
     timeout: float = 10.0
@@ -11,12 +29,23 @@ class APIClient:
             self,
             base_url: str,
             default_params: Optional[Dict[str, Any]] = None,
+            deadline: float = API_DEADLINE,
+            retries: int = API_RETRIES,
+            backoff: float = API_BACKOFF,
+            hedge_after: float = API_HEDGE_AFTER,
     ) -> None:
         self.base_url = base_url
         self.default_params = default_params or {}
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
 
-    def set_path(self, path_params: List[str]) -> None:
-        self.base_url = self.base_url.format(
+    def build_url(self, path_params: Optional[List[str]] = None) -> str:
+        # base_url 의 {} 자리에 요청별 path 값을 채운 새 URL (공유 상태는 바꾸지 않음)
+        if not path_params:
+            return self.base_url
+        return self.base_url.format(
             *[quote(param) for param in path_params]
         )
 
@@ -24,28 +53,101 @@ class APIClient:
             self,
             extra_params: Optional[Dict[str, Any]] = None,
             client: Optional[httpx.AsyncClient] = None,
+            path_params: Optional[List[str]] = None,
+            deadline: Optional[float] = None,
     ) -> Dict[str, Any]:
-        close_client = False
         data: Dict[str, Any] = {}
 
+        url = self.build_url(path_params)
         query_params: Dict[str, Any] = {
             **self.default_params,
             **(extra_params or {}),
         }
+        deadline = self.deadline if deadline is None else deadline
 
-        if client is None:
-            client = httpx.AsyncClient(timeout=self.timeout)
-            close_client = True
-
+        api_call_stats["calls"] += 1
         try:
-            response = await client.get(self.base_url, params=query_params)
-            response.raise_for_status()
+            response = await asyncio.wait_for(self._get_with_retries(url, query_params, client, deadline), deadline)
             data = response.json()
+        except asyncio.TimeoutError:
+            api_call_stats["deadline_exceeded"] += 1
+            print(f"error occurred: deadline {deadline}s exceeded for {url}")
         except Exception as exc:
             print(f"error occurred: {exc}")
-        finally:
-            if close_client:
-                await client.aclose()
 
         return data
 
+    async def _get_with_retries(
+            self,
+            url: str,
+            params: Dict[str, Any],
+            client: Optional[httpx.AsyncClient],
+            deadline: float,
+    ) -> httpx.Response:
+        expires_at = time.monotonic() + deadline
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._hedged_get(url, params, client, expires_at)
+                response.raise_for_status()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+                retryable = not isinstance(exc, httpx.HTTPStatusError) or exc.response.status_code in RETRY_STATUS_CODES
+                if not retryable or attempt == self.retries:
+                    raise
+
+            # 지수 backoff 에 jitter 를 섞어 여러 요청이 동시에 다시 몰리지 않도록 함
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if time.monotonic() + delay >= expires_at:
+                raise asyncio.TimeoutError()
+
+            api_call_stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def _get(
+            self,
+            url: str,
+            params: Dict[str, Any],
+            client: Optional[httpx.AsyncClient],
+            expires_at: float,
+    ) -> httpx.Response:
+        timeout = max(0.001, min(self.timeout, expires_at - time.monotonic()))
+        # client 를 넘기지 않으면 앱 전체가 공유하는 keep-alive 커넥션 풀 사용
+        if client is None:
+            return await http_pool.get(url, params=params, timeout=timeout)
+        return await client.get(url, params=params, timeout=timeout)
+
+    async def _hedged_get(
+            self,
+            url: str,
+            params: Dict[str, Any],
+            client: Optional[httpx.AsyncClient],
+            expires_at: float,
+    ) -> httpx.Response:
+        if self.hedge_after <= 0:
+            return await self._get(url, params, client, expires_at)
+
+        first = asyncio.ensure_future(self._get(url, params, client, expires_at))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_after)
+            if done:
+                return first.result()
+
+            # 첫 요청이 느리면 같은 GET 을 하나 더 보내고 먼저 성공한 응답을 사용
+            api_call_stats["hedges"] += 1
+            pending.add(asyncio.ensure_future(self._get(url, params, client, expires_at)))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            api_call_stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
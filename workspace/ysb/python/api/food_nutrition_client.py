@@ -1,8 +1,11 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from api.api_client import APIClient
+from api.lookup_cache import lookup_cache
 from models.food_nutrition import Food
 
+import asyncio
+import json
 import os
 
 
@@ -22,9 +25,12 @@ class FoodNutritionClient:
         for k, v in Food.model_fields.items()
     }
 
-    def __init__(self) -> None:
+    BASE_URL = "https://apis.data.go.kr/1471000/FoodNtrCpntDbInfo02/getFoodNtrCpntDbInq02"
+
+    def __init__(self, base_url: str = BASE_URL) -> None:
+        # base_url 을 바꾸면 로컬 stub 서버로 테스트 가능 (services.nutrition_import --base-url)
         self.client = APIClient(
-            base_url="https://apis.data.go.kr/1471000/FoodNtrCpntDbInfo02/getFoodNtrCpntDbInq02",
+            base_url=base_url,
             default_params={
                 "serviceKey": os.getenv("NUTRITION_API_KEY"),
                 "type": "json",
@@ -36,25 +42,43 @@ class FoodNutritionClient:
         return await self.client.fetch(query_params)
 
 
-    async def _fetch_latest_row(self, query_params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    async def fetch_page(self, page_no: int, page_size: int = 100) -> Optional[Dict[str, Any]]:
+        # 전체 데이터셋을 페이지 단위로 조회 (일괄 적재용). 요청이 실패하면 None
+        response = await self._fetch_response({"pageNo": page_no, "numOfRows": page_size})
+        if "body" not in response:
+            return None
+        return response["body"]
+
+    async def _fetch_latest_row(self, query_params: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        # (최신 행, 캐시 가능 여부). 요청 실패로 body 가 없으면 캐시하지 않는다
         response = await self._fetch_response(query_params)
+        if "body" not in response:
+            return None, False
 
         body = response.get("body", {})
         items = body.get("items", [])
         total_count = body.get("totalCount", 0)
 
         if total_count < 1:
-            return None
+            return None, True
 
         items. sort(key=lambda item: item["UPDATE_DATE"], reverse=True)
-        return items[0]
+        return items[0], True
 
     async def get_food_data(self, query_params: Optional[Dict[str, Any]] = None):
-        row = await self._fetch_latest_row(query_params)
+        cache_key = json.dumps(query_params or {}, sort_keys=True, ensure_ascii=False)
+        hit, cached = await asyncio.to_thread(lookup_cache.get, "nutrition", cache_key)
+        if hit:
+            return cached
 
-        if row is None:
-            return None
+        row, cacheable = await self._fetch_latest_row(query_params)
+        food_data = self._to_food_data(row) if row is not None else None
+
+        if cacheable:
+            await asyncio.to_thread(lookup_cache.put, "nutrition", cache_key, food_data)
+        return food_data
 
+    def _to_food_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
         food_data: Dict[str, Any] = {}
 
         for raw_key, raw_value in row.items():
@@ -0,0 +1,115 @@
+from typing import Any, Dict, Optional
+from collections import deque
+
+from saveus_common.timings import percentile
+
+import httpx
+
+import os
+import time
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 10))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SEC", 60))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT_SEC", 10))
+# h2 패키지가 설치되어 있어야 사용 가능 (https 호스트에만 적용)
+HTTP2 = os.getenv("HTTP2", "0") == "1"
+
+
+class HostStats:
+    def __init__(self, window: int = 1000) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "new_connections": self.new_connections,
+            # 새 TCP 연결 없이 keep-alive 커넥션으로 처리된 비율
+            "reuse_ratio": 1 - self.new_connections / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(self._latencies, 0.50) * 1000,
+            "p95_ms": percentile(self._latencies, 0.95) * 1000,
+        }
+
+
+class HTTPClientPool:
+    """
+    앱 전체에서 공유하는 httpx.AsyncClient. 호스트별 keep-alive 커넥션을 재사용한다.
+    FastAPI lifespan 에서 open / close 하며, 열지 않은 상태에서 요청하면 처음 사용할 때 연다.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = HTTP_MAX_CONNECTIONS,
+            max_keepalive: int = HTTP_MAX_KEEPALIVE,
+            keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+            timeout: float = HTTP_TIMEOUT,
+            http2: bool = HTTP2,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.http2 = http2
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self.hosts: Dict[str, HostStats] = {}
+
+    async def open(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        # transport 에 httpx.MockTransport 를 넘기면 네트워크 없이 테스트 가능
+        if self._client is not None:
+            await self.close()
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        try:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, http2=self.http2, transport=transport)
+        except ImportError as exc:
+            print(f"error occurred: {exc}")
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=transport)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> httpx.Response:
+        if self._client is None:
+            await self.open()
+
+        host = httpx.URL(url).host
+        stats = self.hosts.setdefault(host, HostStats())
+        stats.requests += 1
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # httpcore 가 새 커넥션을 열 때만 connect_tcp 이벤트가 발생
+            if event_name == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+
+        started = time.perf_counter()
+        try:
+            response = await self._client.get(url, params=params, extensions={"trace": trace}, **kwargs)
+        except Exception:
+            stats.errors += 1
+            raise
+        stats._latencies.append(time.perf_counter() - started)
+
+        if response.is_error:
+            stats.errors += 1
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": self._client is not None,
+            "http2": self.http2,
+            "hosts": {host: stats.snapshot() for host, stats in self.hosts.items()},
+        }
+
+
+http_pool = HTTPClientPool()
@@ -0,0 +1,240 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils import DATA_DIR
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LOOKUP_CACHE_PATH = os.getenv("LOOKUP_CACHE_PATH", str(DATA_DIR / "lookup_cache.sqlite3"))
+# 0 이면 캐시를 사용하지 않음
+LOOKUP_CACHE_ENABLED = os.getenv("LOOKUP_CACHE_ENABLED", "1") == "1"
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL_SEC", 7 * 24 * 3600))
+# 외부 API 에 없는 바코드 / 품목번호는 짧게만 기억해 두고 다시 확인
+LOOKUP_CACHE_NEGATIVE_TTL = float(os.getenv("LOOKUP_CACHE_NEGATIVE_TTL_SEC", 6 * 3600))
+LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv("LOOKUP_CACHE_MAX_ENTRIES", 200_000))
+
+
+class LookupCache:
+    """
+    외부 API 조회 결과(바코드 -> 상품, 품목번호 -> 영양정보)를 SQLite 파일에 저장하는 캐시.
+    값이 None 이면 '없음' 결과로 보고 negative_ttl 동안만 유지한다.
+    """
+
+    def __init__(
+            self,
+            path: str = LOOKUP_CACHE_PATH,
+            ttl: float = LOOKUP_CACHE_TTL,
+            negative_ttl: float = LOOKUP_CACHE_NEGATIVE_TTL,
+            max_entries: int = LOOKUP_CACHE_MAX_ENTRIES,
+            enabled: bool = LOOKUP_CACHE_ENABLED,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookup_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lookup_cache_accessed ON lookup_cache (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def _count(self, namespace: str, name: str) -> None:
+        counters = self.counters.setdefault(namespace, {"hits": 0, "negative_hits": 0, "misses": 0, "puts": 0})
+        counters[name] += 1
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        """(hit 여부, 값) 을 반환. 값이 None 이면 '없음' 으로 캐시된 결과."""
+        if not self.enabled:
+            return False, None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM lookup_cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+
+            if row is None or row[1] <= now:
+                self._count(namespace, "misses")
+                return False, None
+
+            conn.execute(
+                "UPDATE lookup_cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+
+        if row[0] is None:
+            self._count(namespace, "negative_hits")
+            return True, None
+
+        self._count(namespace, "hits")
+        return True, json.loads(row[0])
+
+    def put(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.put_many(namespace, [(key, value)], ttl)
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, Any]], ttl: Optional[float] = None) -> int:
+        if not self.enabled:
+            return 0
+
+        now = time.time()
+        rows = []
+        for key, value in items:
+            expires_at = now + (ttl if ttl is not None else self.ttl if value is not None else self.negative_ttl)
+            encoded = json.dumps(value, ensure_ascii=False) if value is not None else None
+            rows.append((namespace, key, encoded, expires_at, now))
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO lookup_cache (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+
+            for _ in rows:
+                self._count(namespace, "puts")
+
+            self._puts_since_evict += len(rows)
+            # 매번 개수를 세지 않고 일정량 쓸 때마다 정리
+            if self._puts_since_evict >= max(1, self.max_entries // 100):
+                self._puts_since_evict = 0
+                self._evict(conn, now)
+
+        return len(rows)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        removed = conn.execute("DELETE FROM lookup_cache WHERE expires_at <= ?", (now,)).rowcount
+
+        overflow = conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            # 가장 오래 조회되지 않은 항목부터 삭제
+            removed += conn.execute(
+                "DELETE FROM lookup_cache WHERE rowid IN "
+                "(SELECT rowid FROM lookup_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return removed
+
+    def purge(self) -> int:
+        with self._lock:
+            return self._evict(self._connection(), time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+
+        with self._lock:
+            entries = self._connection().execute(
+                "SELECT namespace, COUNT(*), SUM(value IS NULL) FROM lookup_cache GROUP BY namespace"
+            ).fetchall()
+
+        result: Dict[str, Any] = {"enabled": True, "path": self.path}
+        for namespace, count, negative in entries:
+            result[namespace] = {"entries": count, "negative_entries": negative or 0}
+        for namespace, counters in self.counters.items():
+            lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+            result.setdefault(namespace, {}).update(
+                counters,
+                hit_rate=(counters["hits"] + counters["negative_hits"]) / lookups if lookups else 0.0,
+            )
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+lookup_cache = LookupCache()
+
+
+async def _warm_barcodes(barcodes: Iterable[str], concurrency: int) -> None:
+    from api.product_info_client import ProductInfoClient
+    from api.http_pool import http_pool
+
+    client = ProductInfoClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(barcode: str) -> None:
+        async with semaphore:
+            await client.get_prd_report_no(barcode)
+
+    await http_pool.open()
+    try:
+        await asyncio.gather(*(warm(barcode) for barcode in barcodes))
+    finally:
+        await http_pool.close()
+
+
+def main() -> None:
+    """
+    python -m api.lookup_cache import barcode barcodes.jsonl   # {"key": "880...", "value": ["상품명", "품목번호"]}
+    python -m api.lookup_cache warm barcodes.txt              # 바코드 한 줄에 하나, C005 API 로 조회해 캐시
+    python -m api.lookup_cache stats | purge
+    """
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = sub.add_parser("import")
+    import_parser.add_argument("namespace", choices=["barcode", "nutrition"])
+    import_parser.add_argument("file")
+
+    warm_parser = sub.add_parser("warm")
+    warm_parser.add_argument("file")
+    warm_parser.add_argument("--concurrency", type=int, default=8)
+
+    sub.add_parser("stats")
+    sub.add_parser("purge")
+
+    args = parser.parse_args()
+    # python -m 으로 실행하면 이 파일이 __main__ 으로 한 번 더 로드되므로, 클라이언트와 같은 인스턴스를 사용
+    from api.lookup_cache import lookup_cache
+
+    if args.command == "import":
+        with open(args.file, encoding="utf-8") as f:
+            items = [(str(item["key"]), item.get("value")) for item in (json.loads(line) for line in f if line.strip())]
+        print(f"imported {lookup_cache.put_many(args.namespace, items)} entries")
+    elif args.command == "warm":
+        with open(args.file, encoding="utf-8") as f:
+            barcodes = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+        asyncio.run(_warm_barcodes(barcodes, args.concurrency))
+        print(f"warmed {len(barcodes)} barcodes")
+    elif args.command == "purge":
+        print(f"removed {lookup_cache.purge()} entries")
+
+    print(json.dumps(lookup_cache.stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from api.api_client import APIClient
+from api.lookup_cache import lookup_cache
 
 import os
 import asyncio
@@ -17,20 +18,31 @@ class ProductInfoClient:
             base_url=f"http://openapi.foodsafetykorea.go.kr/api/{API_KEY}/C005/json/1/10/BAR_CD={{}}",
         )
 
-    async def _fetch_response(self):
-        response = await self.client.fetch()
+    async def _fetch_response(self, barcode_number: str):
+        # 바코드는 요청마다 URL 에 채워 넣고 공유 클라이언트의 base_url 은 바꾸지 않음
+        response = await self.client.fetch(path_params=[barcode_number])
         return response
 
     async def get_prd_report_no(self, barcode_number: str) -> Optional[tuple] :
-        self.client.set_path([barcode_number])
-        response = await self._fetch_response()
+        # 같은 바코드는 로컬 캐시에서 응답 (없는 바코드도 짧은 TTL 로 기억)
+        hit, cached = await asyncio.to_thread(lookup_cache.get, "barcode", barcode_number)
+        if hit:
+            return tuple(cached) if cached else None
 
+        response = await self._fetch_response(barcode_number)
+
+        result = None
         rows = response.get("C005", {}).get("row", [])
         if rows:
             for row in sorted(rows, key=lambda d: d.get("PRMS_DT", ""), reverse=True):
                 if (product_name:=row.get("PRDLST_NM")) and (product_number := row.get("PRDLST_REPORT_NO")):
-                    return product_name, product_number
-        return None
+                    result = product_name, product_number
+                    break
+
+        # 요청 자체가 실패한 경우(빈 응답)는 캐시하지 않음
+        if "C005" in response:
+            await asyncio.to_thread(lookup_cache.put, "barcode", barcode_number, list(result) if result else None)
+        return result
 
 
 if __name__ == '__main__':
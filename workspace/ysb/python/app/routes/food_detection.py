@@ -1,24 +1,142 @@
+from typing import Any, AsyncIterator, Dict, List
+
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from services.food_detection import detect_food
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from services.food_detection import (
+    detect_food,
+    detection_timings,
+    food_nutrition_repository,
+    food_name_index,
+    barcode_flight,
+    report_no_flight,
+)
+from services.detection_cache import detection_cache
+from ml.yolo_inference import batch_engine
+from api import http_pool
+from api.api_client import api_call_stats
+from api.lookup_cache import lookup_cache
+from saveus_common.image_ingest import ImageIngestError, read_upload
+from utils.executors import detection_executors
+
+import asyncio
+import json
+import os
 
 router = APIRouter(prefix="/food", tags=["food"])
 
+# 동시에 메모리에 올라가는 업로드 수를 제한해 워커 메모리를 일정하게 유지
+UPLOAD_MAX_CONCURRENT = int(os.getenv("UPLOAD_MAX_CONCURRENT", 16))
+upload_slots = asyncio.Semaphore(UPLOAD_MAX_CONCURRENT)
+
+# 배치 요청에서 동시에 메모리에 올리는 이미지 수 (YOLO 배치 크기와 맞추는 것을 권장)
+BATCH_WINDOW = int(os.getenv("DETECTION_BATCH_WINDOW", 8))
+BATCH_MAX_FILES = int(os.getenv("DETECTION_BATCH_MAX_FILES", 100))
+
 
 @router.post("/detect")
 async def detect_food_route(file: UploadFile = File(...)):
     if file is None:
         raise HTTPException(status_code=400, detail="파일 없음")
 
-    if file.content_type not in ["image/png", "image/jpeg"]:
-        raise HTTPException(status_code=400, detail="잘못된 파일 유형")
-
-    content = await file.read()
-
-    if len(content) == 0:
-        raise HTTPException(status_code=400, detail="빈 파일")
+    # 슬롯은 업로드를 읽는 동안만 잡고, 추론은 슬롯을 반납한 뒤 실행
+    try:
+        async with upload_slots:
+            content = await read_upload(file.read, size_hint=file.size)
+    except ImageIngestError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
 
     nutrition_items = await detect_food(content)
 
     return {
         "items": nutrition_items
     }
+
+
+@router.post("/detect/batch")
+async def detect_food_batch_route(files: List[UploadFile] = File(...)):
+    if not files:
+        raise HTTPException(status_code=400, detail="파일 없음")
+
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"파일은 최대 {BATCH_MAX_FILES}개까지 가능")
+
+    # FastAPI 는 응답 전송이 끝난 뒤에 업로드 파일을 닫으므로, 내용은 스트리밍하면서 BATCH_WINDOW 개씩만 읽는다
+    return StreamingResponse(_stream_batch(files), media_type="application/x-ndjson")
+
+
+async def _detect_one(index: int, file: UploadFile) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"index": index, "filename": file.filename}
+
+    try:
+        async with upload_slots:
+            content = await read_upload(file.read, size_hint=file.size)
+    except ImageIngestError as exc:
+        result["error"] = exc.detail
+        return result
+    finally:
+        # 읽은 업로드는 바로 닫아 임시 파일을 정리
+        await file.close()
+
+    try:
+        result["items"] = await detect_food(content)
+    except Exception as exc:
+        print(f"error occurred: {exc}")
+        result["error"] = "분석 실패"
+
+    return result
+
+
+async def _stream_batch(files: List[UploadFile]) -> AsyncIterator[str]:
+    # 이미지 버퍼는 _detect_one 안에서만 참조되므로 결과 줄을 내보내면 함께 해제된다
+    pending = set()
+
+    try:
+        for index, file in enumerate(files):
+            if len(pending) >= BATCH_WINDOW:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield _to_ndjson(task.result())
+
+            pending.add(asyncio.ensure_future(_detect_one(index, file)))
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield _to_ndjson(task.result())
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _to_ndjson(result: Dict[str, Any]) -> str:
+    return json.dumps(jsonable_encoder(result), ensure_ascii=False) + "\n"
+
+
+@router.post("/nutrition/refresh")
+async def refresh_nutrition_route(full: bool = False):
+    # 다른 프로세스에서 FOOD_NUTRITION 에 행을 추가한 뒤 호출하면 카탈로그에 바로 반영
+    if food_nutrition_repository.catalog is None:
+        return {"catalog": False, "refreshed": 0}
+
+    refreshed = await detection_executors.run_io(food_nutrition_repository.refresh, full)
+    return {"catalog": True, "refreshed": refreshed, "size": len(food_nutrition_repository.catalog)}
+
+
+@router.get("/detect/stats")
+async def detect_stats_route():
+    # 캐시 통계는 SQLite 전체를 집계하므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    lookup_cache_stats = await asyncio.to_thread(lookup_cache.stats)
+    return {
+        "batching": batch_engine.stats.snapshot(),
+        "cache": detection_cache.stats(),
+        "timings": detection_timings.snapshot(),
+        "name_index": food_name_index.stats(),
+        "http": {**http_pool.stats(), "calls": dict(api_call_stats)},
+        "lookup_cache": lookup_cache_stats,
+        "single_flight": {
+            "barcode": barcode_flight.stats(),
+            "report_no": report_no_flight.stats(),
+        },
+        "db_pool": food_nutrition_repository.pool_stats(),
+    }
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from utils.readiness import readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live_route():
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready_route():
+    # 모든 모델의 로드와 warm-up 이 끝나기 전에는 503 (로드밸런서가 트래픽을 보내지 않도록)
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.status())
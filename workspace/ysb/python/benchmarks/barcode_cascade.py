@@ -0,0 +1,69 @@
+"""
+기존 3단계 전체 디코딩과 cascade(+영역 검출) 방식의 BarcodeDetector 를 비교한다.
+바코드 사진 폴더와 바코드가 없는 일반 식단 사진 폴더를 각각 측정한다.
+
+    python -m benchmarks.barcode_cascade --barcode-dir samples/barcode --plain-dir samples/meal
+"""
+from typing import Dict, List
+from pathlib import Path
+
+from utils.barcode_detector import BarcodeDetector
+from utils.image_ingest import decode_image
+from saveus_common.timings import percentile
+
+import argparse
+import time
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+DETECTORS = {
+    "legacy": BarcodeDetector(cascade=False, localize=False),
+    "cascade": BarcodeDetector(cascade=True, localize=False),
+    "cascade+localize": BarcodeDetector(cascade=True, localize=True),
+}
+
+
+def run_set(directory: Path, repeat: int) -> None:
+    paths = sorted(p for p in directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    images = [decode_image(p.read_bytes()) for p in paths]
+    if not images:
+        print(f"{directory}: 이미지 없음")
+        return
+
+    reference: Dict[str, List[str]] = {}
+    for name, detector in DETECTORS.items():
+        latencies: List[float] = []
+        found = 0
+        changed = 0
+
+        for path, image in zip(paths, images):
+            for _ in range(repeat):
+                started = time.perf_counter()
+                codes = detector.detect_codes_from_array(image)
+                latencies.append(time.perf_counter() - started)
+
+            found += bool(codes)
+            if name == "legacy":
+                reference[path.name] = codes
+            elif set(codes) - set(reference[path.name]) or (reference[path.name] and not codes):
+                changed += 1
+
+        print(
+            f"[{directory.name}] {name:<17} found={found}/{len(images)} changed={changed} "
+            f"mean={sum(latencies) / len(latencies) * 1000:.1f}ms p95={percentile(latencies, 0.95) * 1000:.1f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--barcode-dir", type=Path, required=True)
+    parser.add_argument("--plain-dir", type=Path, required=True)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_set(args.barcode_dir, args.repeat)
+    run_set(args.plain_dir, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+동시 업로드 상황에서 detect_food 의 지연시간과 이벤트 루프 지연을 측정한다.
+before: 모든 단계를 이벤트 루프에서 직접 실행 (inline)
+after : DETECTION_EXECUTOR / YOLO_EXECUTOR 설정(또는 --mode, --inference-mode)으로 실행
+
+    python -m benchmarks.detection_concurrency sample1.jpg sample2.jpg --requests 64 --concurrency 16
+"""
+from typing import Dict, List
+
+from services.food_detection import detect_food
+from ml.yolo_inference import batch_engine
+from utils.executors import detection_executors
+from saveus_common.timings import percentile
+
+import argparse
+import asyncio
+import time
+
+
+async def _probe_loop_lag(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_load(images: List[bytes], requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    lags: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await detect_food(images[index % len(images)])
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(stop, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(upload(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+
+    return {
+        "throughput_rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "loop_lag_p99_ms": percentile(lags, 0.99) * 1000,
+        "loop_lag_max_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mode", default=None)
+    parser.add_argument("--inference-mode", default=None)
+    args = parser.parse_args()
+
+    images = []
+    for path in args.images:
+        with open(path, "rb") as f:
+            images.append(f.read())
+
+    scenarios = [
+        ("before", "inline", "inline"),
+        ("after", args.mode, args.inference_mode),
+    ]
+
+    for label, mode, inference_mode in scenarios:
+        detection_executors.configure(mode=mode, inference_mode=inference_mode)
+        batch_engine.max_concurrent_batches = detection_executors.inference_workers
+
+        result = asyncio.run(run_load(images, args.requests, args.concurrency))
+        print(
+            f"[{label}] mode={detection_executors.mode} inference={detection_executors.inference_mode} "
+            + " ".join(f"{k}={v:.1f}" for k, v in result.items())
+        )
+
+    detection_executors.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+당뇨 위험도 모델의 sklearn predict_proba(DataFrame) 경로와 booster inplace_predict(float32 배열) 경로를 비교한다.
+합성 사용자로 확률 / /api/calculate-score 결과가 같은지 확인하고 로드 시간과 호출당 지연을 측정한다.
+모델 파일(DIET_MODEL_PATH, 기본 diabetes_risk_model_v5_xgb.pkl) 이 현재 경로에 있어야 한다.
+
+    python -m benchmarks.diet_model_parity --users 5000 --repeat 20
+"""
+from typing import Dict, List
+
+from ml import main as diet
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+
+def make_users(count: int, seed: int) -> List[diet.UserDietInfo]:
+    rng = random.Random(seed)
+    users = []
+    for user_id in range(count):
+        users.append(diet.UserDietInfo(
+            user_id=user_id,
+            age=rng.randint(20, 80),
+            sex=rng.choice([1, 2]),
+            # 0 / 100 은 0 나누기와 권장 칼로리 0 경로를 확인하기 위한 값
+            height=rng.choice([0.0, 100.0, rng.uniform(140, 200), rng.uniform(140, 200)]),
+            weight=rng.choice([0.0, rng.uniform(40, 120), rng.uniform(40, 120)]),
+            total_kcal=rng.choice([0.0, rng.uniform(3000, 20000), rng.uniform(3000, 20000)]),
+            total_carbs=rng.choice([0.0, rng.uniform(300, 3000)]),
+            total_fat=rng.uniform(0, 800),
+            total_protein=rng.uniform(0, 800),
+            total_sodium=rng.uniform(0, 30000),
+            total_sugar=rng.uniform(0, 500),
+        ))
+    return users
+
+
+def measure(users: List[diet.UserDietInfo], matrix: np.ndarray, repeat: int) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    for batch in (1, 100, len(matrix)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            diet.predict_risk(matrix[:batch])
+        timings[f"predict_{batch}_ms"] = (time.perf_counter() - started) / repeat * 1000
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        diet.calculate_diet_score(users)
+    timings["endpoint_ms"] = (time.perf_counter() - started) / repeat * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    users = make_users(args.users, args.seed)
+    matrix, valid = diet._build_features(users)
+    matrix = matrix[valid]
+
+    risks: Dict[str, np.ndarray] = {}
+    scores: Dict[str, list] = {}
+    for backend in ("sklearn", "booster"):
+        diet.load_diet_model(backend)
+        if diet.model_status["state"] != "ready" or diet.diet_backend != backend:
+            print(f"{backend}: 로드 실패 {diet.model_status}")
+            sys.exit(1)
+
+        risks[backend] = np.asarray(diet.predict_risk(matrix))
+        scores[backend] = diet.calculate_diet_score(users)
+        timings = measure(users, matrix, args.repeat)
+        print(f"{backend:8s} load_ms={diet.model_status['load_ms']:.1f} "
+              + " ".join(f"{name}={value:.3f}" for name, value in timings.items()))
+
+    max_diff = float(np.max(np.abs(risks["sklearn"] - risks["booster"]))) if len(matrix) else 0.0
+    same_scores = scores["sklearn"] == scores["booster"]
+    print(f"rows={len(matrix)} max_abs_diff={max_diff:.3g} identical_scores={same_scores}")
+
+    if max_diff > 0 or not same_scores:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+외부 API 호출 비용을 로컬 stub 서버로 측정한다.
+before: 요청마다 httpx.AsyncClient 를 새로 만들고 닫음 (매번 TCP 연결)
+after : 공유 HTTPClientPool (keep-alive 커넥션 재사용)
+
+    python -m benchmarks.http_pool --requests 500 --concurrency 16
+    python -m benchmarks.http_pool --mock     # 네트워크 없이 httpx.MockTransport 로 동작만 확인
+"""
+from typing import List
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api.http_pool import HTTPClientPool
+from saveus_common.timings import percentile
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"C005": {"row": []}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(get, url: str, requests: int, concurrency: int) -> str:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return (
+        f"throughput_rps={requests / elapsed:.1f} "
+        f"p50_ms={percentile(latencies, 0.50) * 1000:.2f} p99_ms={percentile(latencies, 0.99) * 1000:.2f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mock", action="store_true")
+    args = parser.parse_args()
+
+    pool = HTTPClientPool()
+
+    if args.mock:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"C005": {"row": []}}))
+        await pool.open(transport=transport)
+        print("pooled (mock):", await run(pool.get, "http://stub.local/api", args.requests, args.concurrency))
+        print(pool.stats())
+        await pool.close()
+        return
+
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api"
+
+    async def per_call_client(target: str) -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            return await client.get(target)
+
+    try:
+        print("per-call client:", await run(per_call_client, url, args.requests, args.concurrency))
+
+        await pool.open()
+        print("shared pool    :", await run(pool.get, url, args.requests, args.concurrency))
+        print(pool.stats())
+        await pool.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
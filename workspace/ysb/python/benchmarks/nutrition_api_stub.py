@@ -0,0 +1,91 @@
+"""
+getFoodNtrCpntDbInq02 형식으로 합성 데이터를 페이지 단위로 돌려주는 로컬 stub 서버.
+services.nutrition_import 를 외부 API / 서비스키 없이 실행해 볼 때 사용한다.
+
+    python -m benchmarks.nutrition_api_stub --rows 20000 --port 8765 --fail-rate 0.05
+    python -m services.nutrition_import --base-url http://127.0.0.1:8765/api --dry-run
+"""
+from typing import Any, Dict, List
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import argparse
+import json
+import random
+
+
+def make_rows(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        rows.append({
+            # 일부 이름은 일부러 겹치게 해 최신 UPDATE_DATE 행만 남는지 확인
+            "FOOD_NM_KR": f"테스트식품{i % max(1, count - count // 20)}",
+            "FOOD_CAT1_NM": rng.choice(["과자류", "음료류", "빵류", "면류"]),
+            "AMT_NUM1": f"{rng.uniform(10, 600):.2f}",
+            "AMT_NUM3": f"{rng.uniform(0, 30):.2f}",
+            "AMT_NUM4": f"{rng.uniform(0, 40):.2f}",
+            "AMT_NUM6": f"{rng.uniform(0, 90):.2f}",
+            "AMT_NUM7": rng.choice(["", "-", f"{rng.uniform(0, 40):.2f}"]),
+            "AMT_NUM8": "",
+            "AMT_NUM9": f"{rng.uniform(0, 300):.1f}",
+            "AMT_NUM13": f"{rng.uniform(0, 2000):.1f}",
+            "UPDATE_DATE": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        })
+    return rows
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rows: List[Dict[str, Any]] = []
+    fail_rate = 0.0
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        page_no = int(query.get("pageNo", ["1"])[0])
+        page_size = int(query.get("numOfRows", ["100"])[0])
+
+        if random.random() < self.fail_rate:
+            self._send(503, {"error": "stub failure"})
+            return
+
+        start = (page_no - 1) * page_size
+        self._send(200, {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE."},
+            "body": {
+                "pageNo": page_no,
+                "numOfRows": page_size,
+                "totalCount": len(self.rows),
+                "items": self.rows[start:start + page_size],
+            },
+        })
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    StubHandler.rows = make_rows(args.rows)
+    StubHandler.fail_rate = args.fail_rate
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    print(f"serving {args.rows} rows on http://127.0.0.1:{args.port}/api")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
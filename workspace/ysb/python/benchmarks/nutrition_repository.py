@@ -0,0 +1,96 @@
+"""
+영양정보 조회 저장소를 동시 요청 상황에서 측정한다. 기본은 SQLite 대체 저장소 (ljr/food_nutrition.csv 로 채움).
+before: 연결 하나를 공유하는 동기 저장소를 IO 스레드 1개로 직렬 실행 (--pool-size 1)
+after : 호출마다 풀에서 커넥션을 빌리는 비동기 저장소 (--pool-size N)
+
+    python -m benchmarks.nutrition_repository --requests 2000 --concurrency 64 --pool-size 8
+    FOOD_NUTRITION_BACKEND=aiomysql python -m benchmarks.nutrition_repository --backend aiomysql
+"""
+from typing import Dict, List
+
+from repositories.async_food_nutrition import (
+    AioMySQLFoodNutritionRepository,
+    AsyncFoodNutritionRepository,
+    SQLiteFoodNutritionRepository,
+)
+from saveus_common.timings import percentile
+
+import argparse
+import asyncio
+import csv
+import random
+import time
+
+from pathlib import Path
+
+DEFAULT_CSV = Path(__file__).resolve().parents[3] / "ljr" / "food_nutrition.csv"
+
+
+def load_names(csv_path: str) -> List[str]:
+    with open(csv_path, encoding="utf-8") as f:
+        return [row["food_name"] for row in csv.DictReader(f)]
+
+
+async def run_load(
+        repository: AsyncFoodNutritionRepository,
+        names: List[str],
+        requests: int,
+        concurrency: int,
+        labels_per_request: int,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    rng = random.Random(0)
+    batches = [rng.sample(names, labels_per_request) for _ in range(requests)]
+
+    async def lookup(batch: List[str]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await repository.get_foods_by_names(batch)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(lookup(batch) for batch in batches))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "throughput_rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["sqlite", "aiomysql"], default="sqlite")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--labels", type=int, default=3)
+    args = parser.parse_args()
+
+    names = load_names(args.csv)
+
+    for pool_size in args.pool_size:
+        if args.backend == "sqlite":
+            repository = SQLiteFoodNutritionRepository(csv_path=args.csv, pool_size=pool_size)
+        else:
+            repository = AioMySQLFoodNutritionRepository(pool_size=pool_size)
+
+        await repository.open()
+        try:
+            result = await run_load(repository, names, args.requests, args.concurrency, args.labels)
+        finally:
+            await repository.close()
+
+        pool = repository.pool_stats()
+        print(
+            f"pool_size={pool_size:<3} "
+            + " ".join(f"{k}={v:.1f}" for k, v in result.items())
+            + f" saturation={pool['saturation']:.2f} acquire_wait_p95_ms={pool['acquire_wait_p95_ms']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+PyTorch 기준으로 export 된 CPU backend 들의 라벨 일치 여부와 지연시간/메모리를 비교한다.
+backend 마다 별도 프로세스에서 모델을 로드하므로 RSS 값이 서로 섞이지 않는다.
+
+    python -m benchmarks.yolo_backends sample1.jpg sample2.jpg --backends pytorch onnx onnx-int8 openvino
+"""
+from typing import Any, Dict, List
+from collections import Counter
+
+from saveus_common.timings import percentile
+
+import argparse
+import multiprocessing
+import time
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _measure(backend: str, images: List[str], repeat: int) -> Dict[str, Any]:
+    from ml.backends import load_model, count_labels
+    from PIL import Image
+
+    name, _, variant = backend.partition("-")
+    rss_before = _rss_mb()
+
+    started = time.perf_counter()
+    model = load_model(name, int8=variant == "int8")
+    load_s = time.perf_counter() - started
+
+    loaded = [Image.open(path).convert("RGB") for path in images]
+    model.predict(loaded[0], verbose=False)
+
+    labels: List[Counter] = []
+    latencies: List[float] = []
+    for _ in range(repeat):
+        labels = []
+        for img in loaded:
+            started = time.perf_counter()
+            pred = model.predict(img, verbose=False)[0]
+            latencies.append(time.perf_counter() - started)
+            labels.append(count_labels(pred))
+
+    return {
+        "labels": labels,
+        "load_s": load_s,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "rss_mb": _rss_mb() - rss_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "onnx", "onnx-int8", "openvino"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = ["pytorch"] + [b for b in args.backends if b != "pytorch"]
+    context = multiprocessing.get_context("spawn")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for backend in backends:
+            results[backend] = pool.apply(_measure, (backend, args.images, args.repeat))
+
+    reference = results["pytorch"]["labels"]
+    for backend, result in results.items():
+        mismatches = [
+            (path, dict(expected), dict(actual))
+            for path, expected, actual in zip(args.images, reference, result["labels"])
+            if expected != actual
+        ]
+        print(
+            f"[{backend}] parity={len(args.images) - len(mismatches)}/{len(args.images)} "
+            f"load={result['load_s']:.2f}s mean={result['mean_ms']:.1f}ms "
+            f"p95={result['p95_ms']:.1f}ms rss=+{result['rss_mb']:.0f}MB"
+        )
+        for path, expected, actual in mismatches:
+            print(f"    {path}: pytorch={expected} {backend}={actual}")
+
+
+if __name__ == "__main__":
+    main()
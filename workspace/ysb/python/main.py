@@ -1,11 +1,102 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from api import http_pool
+from api.lookup_cache import lookup_cache
 from app.routes.food_detection import router as food_router
+from app.routes.health import router as health_router
+from ml.yolo_inference import get_worker_warm_up, warm_up, warm_up_worker
+from services import food_detection
+from services.food_detection import (
+    close_repository,
+    food_nutrition_repository,
+    load_class_table,
+    load_food_name_index,
+    open_repository,
+)
+from utils.executors import detection_executors
+from utils.readiness import readiness
 
+import asyncio
 import os
 
-app = FastAPI()
+YOLO_WARMUP_RUNS = int(os.getenv("YOLO_WARMUP_RUNS", 2))
+# 다른 프로세스가 추가한 영양정보를 카탈로그 / 음식명 인덱스에 반영하는 주기 (0 이면 비활성)
+FOOD_NUTRITION_REFRESH_SEC = float(os.getenv("FOOD_NUTRITION_REFRESH_SEC", 300))
+
+
+async def warm_up_models() -> None:
+    readiness.pending("yolo")
+    try:
+        if detection_executors.inference_mode == "inline":
+            # 추론은 루프에서 직접 실행하지만 모델 로드 / warm-up 은 루프를 막지 않도록 스레드에서
+            results = [await asyncio.to_thread(warm_up, YOLO_WARMUP_RUNS)]
+        else:
+            # 워커마다 initializer(warm_up_worker) 로 warm-up 을 마친 뒤 작업을 받으므로,
+            # 워커가 모두 시작되도록 작업을 제출하고 워커별 측정값만 모은다
+            results = await asyncio.gather(*(
+                detection_executors.run_inference(get_worker_warm_up)
+                for _ in range(detection_executors.inference_workers)
+            ))
+            results = list({result["worker"]: result for result in results}.values())
+        # 클래스 번호 -> 영양정보 배열도 준비된 뒤에 ready
+        class_table = await load_class_table()
+        readiness.record(
+            "yolo",
+            load_ms=max(r["load_ms"] for r in results),
+            warmup_ms=max(r["warmup_ms"] for r in results),
+            warmup_runs=YOLO_WARMUP_RUNS,
+            workers=len(results),
+            classes=len(class_table),
+            classes_without_nutrition=sum(food is None for food in class_table),
+        )
+    except Exception as exc:
+        print(f"error occurred: {exc}")
+        readiness.fail("yolo", exc)
+
+
+async def refresh_nutrition_data(interval: float) -> None:
+    while True:
+        try:
+            if food_nutrition_repository.catalog is not None:
+                await detection_executors.run_io(food_nutrition_repository.refresh)
+            await load_food_name_index()
+            # 새로 추가된 영양정보로 비어 있던 클래스를 채움 (모델 로드 전에는 건너뜀)
+            if food_detection.class_table is not None:
+                await load_class_table()
+        except Exception as exc:
+            print(f"error occurred: {exc}")
+
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델 로드는 백그라운드로 진행하고, 완료 전까지 /health/ready 는 503 을 반환
+    detection_executors.set_inference_initializer(warm_up_worker, YOLO_WARMUP_RUNS)
+    warm_up_task = asyncio.create_task(warm_up_models())
+
+    # 외부 API 용 HTTP 커넥션 풀과 비동기 저장소는 시작 시 열고 종료 시 닫는다
+    await http_pool.open()
+    await open_repository()
+
+    # 음식명 인덱스를 만들고, 주기적으로 카탈로그와 함께 갱신
+    refresh_task = asyncio.create_task(refresh_nutrition_data(FOOD_NUTRITION_REFRESH_SEC))
+
+    yield
+    warm_up_task.cancel()
+    refresh_task.cancel()
+    await close_repository()
+    await http_pool.close()
+    lookup_cache.close()
+    detection_executors.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 """
@@ -15,12 +106,14 @@ from app.routes.user import router as user_router
 app = FastAPI()
 
 app.include_router(food_router)
+app.include_router(health_router)
 app.include_router(user_router)
 """
 
 
 
 app.include_router(food_router)
+app.include_router(health_router)
 
 app.add_middleware(
     CORSMiddleware,
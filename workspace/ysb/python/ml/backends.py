@@ -0,0 +1,101 @@
+from collections import Counter
+from pathlib import Path
+
+from ml import MODEL_PATH
+
+from ultralytics import YOLO
+
+import argparse
+import os
+import shutil
+
+BACKENDS = ("pytorch", "onnx", "openvino")
+
+WEIGHTS = MODEL_PATH / "saveUs_food_detection.pt"
+
+
+class ModelExportError(Exception):
+    pass
+
+
+def count_labels(pred) -> Counter:
+    return Counter(p["name"] for p in pred.summary())
+
+
+def count_class_ids(pred) -> Counter:
+    # 이름 문자열을 만들지 않고 박스의 클래스 번호만 집계
+    return Counter(int(cls) for cls in pred.boxes.cls.tolist())
+
+
+def _is_stale(exported: Path) -> bool:
+    return not exported.exists() or exported.stat().st_mtime < WEIGHTS.stat().st_mtime
+
+
+def _quantize_onnx(source: Path, target: Path) -> None:
+    # 가중치 INT8 동적 양자화 (보정 데이터 불필요)
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QUInt8)
+
+    # ultralytics 가 클래스 이름을 읽는 metadata 를 원본에서 복사
+    src_model = onnx.load(str(source))
+    dst_model = onnx.load(str(target))
+    del dst_model.metadata_props[:]
+    dst_model.metadata_props.extend(src_model.metadata_props)
+    onnx.save(dst_model, str(target))
+
+
+def export_model(backend: str, int8: bool = False, force: bool = False) -> Path:
+    if backend not in BACKENDS or backend == "pytorch":
+        raise ModelExportError(f"export 대상이 아닌 backend: {backend}")
+
+    if backend == "onnx":
+        onnx_path = WEIGHTS.with_suffix(".onnx")
+        if force or _is_stale(onnx_path):
+            # 마이크로 배칭을 위해 배치 축을 dynamic 으로 export
+            YOLO(WEIGHTS).export(format="onnx", dynamic=True, simplify=True)
+
+        if not int8:
+            return onnx_path
+
+        int8_path = WEIGHTS.with_name(f"{WEIGHTS.stem}_int8.onnx")
+        if force or _is_stale(int8_path):
+            _quantize_onnx(onnx_path, int8_path)
+        return int8_path
+
+    suffix = "_int8_openvino_model" if int8 else "_openvino_model"
+    target = WEIGHTS.with_name(f"{WEIGHTS.stem}{suffix}")
+    if force or _is_stale(target):
+        # INT8 은 NNCF 보정 데이터셋(YOLO_INT8_DATA, data yaml)이 필요
+        exported = YOLO(WEIGHTS).export(
+            format="openvino",
+            dynamic=True,
+            int8=int8,
+            data=os.getenv("YOLO_INT8_DATA") if int8 else None,
+        )
+        if Path(exported) != target:
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.move(str(exported), str(target))
+
+    return target
+
+
+def load_model(backend: str = "pytorch", int8: bool = False) -> YOLO:
+    if backend not in BACKENDS:
+        raise ModelExportError(f"지원하지 않는 backend: {backend}")
+
+    if backend == "pytorch":
+        return YOLO(WEIGHTS)
+
+    return YOLO(export_model(backend, int8), task="detect")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=BACKENDS[1:], default="onnx")
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    print(export_model(args.backend, args.int8, args.force))
@@ -1,23 +1,145 @@
-from typing import List
+from typing import List, Optional, Tuple
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 import joblib
-import pandas as pd
 import numpy as np
+import os
+import time
 
 
-test = FastAPI()
+MODEL_PATH = os.getenv("DIET_MODEL_PATH", "diabetes_risk_model_v5_xgb.pkl")
+# pkl 에서 다시 만들 수 있는 파일을 두는 디렉터리 (기본값은 실행 경로가 아닌 ml/cache)
+MODEL_CACHE_DIR = os.getenv("DIET_MODEL_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+# booster 모드에서 pkl 대신 읽는 XGBoost 네이티브 모델 파일 (없거나 pkl 보다 오래되면 pkl 에서 다시 생성)
+BOOSTER_PATH = os.getenv(
+    "DIET_BOOSTER_PATH",
+    os.path.join(MODEL_CACHE_DIR, os.path.splitext(os.path.basename(MODEL_PATH))[0] + ".ubj"),
+)
+# booster: Booster.inplace_predict 에 float32 배열을 바로 전달 / sklearn: 기존 predict_proba(DataFrame)
+DIET_MODEL_BACKEND = os.getenv("DIET_MODEL_BACKEND", "booster")
+# booster 예측 스레드 수 (0 이면 XGBoost 기본값)
+DIET_MODEL_NTHREAD = int(os.getenv("DIET_MODEL_NTHREAD", 0))
+WARMUP_RUNS = int(os.getenv("DIET_MODEL_WARMUP_RUNS", 3))
+
+FEATURES = ['AGE', 'BMI', 'SEX', 'LOG_PCT_CALORIE', 'PCT_PROTEIN',
+            'LOG_PCT_SODIUM', 'RATIO_SUGAR_TO_CHO', 'LOG_RATIO_FAT', 'RATIO_CHO']
+
+# sklearn 백엔드면 XGBClassifier, booster 백엔드면 xgboost.Booster
+diet_model = None
+diet_backend = DIET_MODEL_BACKEND
+# early stopping 으로 학습된 모델은 predict_proba 와 같이 best_iteration 까지만 사용
+diet_iteration_range = (0, 0)
+# /health/ready 에서 반환하는 모델 로드 상태
+model_status = {"state": "loading"}
+
+
+def _iteration_range(booster) -> Tuple[int, int]:
+    best_iteration = booster.attr("best_iteration")
+    return (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+
+
+def _load_booster():
+    import xgboost
+
+    if os.path.exists(BOOSTER_PATH) and (
+            not os.path.exists(MODEL_PATH) or os.path.getmtime(BOOSTER_PATH) >= os.path.getmtime(MODEL_PATH)):
+        # 네이티브 파일은 pickle(sklearn 래퍼) 복원 없이 바로 읽을 수 있어 시작이 빠름
+        booster = xgboost.Booster(model_file=BOOSTER_PATH)
+    else:
+        booster = joblib.load(MODEL_PATH).get_booster()
+        # 여러 워커가 동시에 시작해도 반쯤 쓴 파일을 읽지 않도록 임시 파일에 저장한 뒤 교체
+        # (XGBoost 는 확장자로 저장 형식을 정하므로 임시 파일도 같은 확장자를 사용)
+        root, ext = os.path.splitext(BOOSTER_PATH)
+        tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(BOOSTER_PATH)), exist_ok=True)
+            booster.save_model(tmp_path)
+            os.replace(tmp_path, BOOSTER_PATH)
+        except Exception as e:
+            print(f"error occurred: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # inplace_predict 는 열 이름을 확인하지 않으므로 학습 때의 특성 순서와 같은지 미리 확인
+    if booster.feature_names is not None and list(booster.feature_names) != FEATURES:
+        raise ValueError(f"feature order mismatch: {booster.feature_names}")
+
+    if DIET_MODEL_NTHREAD > 0:
+        booster.set_param({"nthread": DIET_MODEL_NTHREAD})
+    return booster
+
+
+def _predict_booster(booster, iteration_range: Tuple[int, int], matrix: np.ndarray) -> np.ndarray:
+    proba = booster.inplace_predict(
+        np.ascontiguousarray(matrix, dtype=np.float32),
+        iteration_range=iteration_range,
+    )
+    # binary:logistic 은 (n,) 양성 확률, multi:softprob 은 (n, 2)
+    return proba[:, 1] if proba.ndim == 2 else proba
+
+
+def _predict_sklearn(model, matrix: np.ndarray) -> np.ndarray:
+    import pandas as pd
+
+    return model.predict_proba(pd.DataFrame(matrix, columns=FEATURES))[:, 1]
 
-MODEL_PATH = "diabetes_risk_model_v5_xgb.pkl"
-try:
-    # diabetes_risk_model_v5_xgb.pkl 파일이 현재 실행 경로에 있어야 합니다.
-    diet_model = joblib.load(MODEL_PATH)
-    print(f"✅ 당뇨 모델 로드 성공: {MODEL_PATH}")
-except Exception as e:
-    # 모델 파일이 없는 경우, 이 API는 작동하지 않습니다.
-    print(f"❌ 당뇨 모델 로드 실패: {e}")
-    diet_model = None
+
+def predict_risk(matrix: np.ndarray) -> np.ndarray:
+    # matrix: FEATURES 순서의 (n, 9) 배열 -> 당뇨 발병 확률 (n,)
+    if diet_backend == "booster":
+        return _predict_booster(diet_model, diet_iteration_range, matrix)
+    return _predict_sklearn(diet_model, matrix)
+
+
+def _warm_up_diet_model() -> None:
+    # 합성 입력(아바타 기준값)으로 한 번 예측해 내부 초기화를 미리 수행
+    predict_risk(np.array([[52, 26.0, 1, 0.0, 1.0, 0.0, 0.1, 0.3, 0.6]]))
+
+
+def load_diet_model(backend: str = DIET_MODEL_BACKEND) -> None:
+    global diet_model, diet_backend, diet_iteration_range, model_status
+    try:
+        # diabetes_risk_model_v5_xgb.pkl 파일이 현재 실행 경로에 있어야 합니다.
+        started = time.perf_counter()
+        model = None
+        if backend == "booster":
+            try:
+                model = _load_booster()
+                diet_iteration_range = _iteration_range(model)
+            except Exception as e:
+                print(f"❌ booster 로드 실패, sklearn predict_proba 로 대체합니다: {e}")
+                backend = "sklearn"
+        if model is None:
+            model = joblib.load(MODEL_PATH)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        diet_model, diet_backend = model, backend
+        started = time.perf_counter()
+        for _ in range(WARMUP_RUNS):
+            _warm_up_diet_model()
+        warmup_ms = (time.perf_counter() - started) * 1000
+
+        model_status = {"state": "ready", "backend": backend, "load_ms": load_ms,
+                        "warmup_ms": warmup_ms, "warmup_runs": WARMUP_RUNS}
+        print(f"✅ 당뇨 모델 로드 성공: {MODEL_PATH} ({backend})")
+    except Exception as e:
+        # 모델 파일이 없는 경우, 이 API는 작동하지 않습니다.
+        print(f"❌ 당뇨 모델 로드 실패: {e}")
+        model_status = {"state": "failed", "error": str(e)}
+        diet_model = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(load_diet_model)
+    yield
+
+
+test = FastAPI(lifespan=lifespan)
 
 
 class UserDietInfo(BaseModel):
@@ -45,6 +167,173 @@ test.add_middleware(
 )
 
 
+@test.get("/health/ready")
+def health_ready():
+    ready = model_status["state"] == "ready"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": {"diet_model": model_status}},
+    )
+
+
+def _score_user(u: UserDietInfo) -> dict:
+    # 사용자 한 명을 점수화 (배치 계산에서 값이 유효하지 않은 행의 fallback)
+    # 1. 전처리 (모델 학습 때와 동일한 공식 적용)
+    # BMI 계산
+    bmi = u.weight / ((u.height / 100) ** 2)
+
+    # 성별 권장 칼로리 (남:30, 여:25) * 표준체중
+    rec_calorie = (u.height - 100) * 0.9 * (30 if u.sex == 1 else 25)
+
+    # 비율 계산 (0 나누기 방어 로직)
+    pct_calorie = u.total_kcal / rec_calorie if rec_calorie > 0 else 0
+    pct_protein = u.total_protein / u.weight if u.weight > 0 else 0
+    pct_sodium = u.total_sodium / 2000.0 # 나트륨 권장량 2000mg 대비 비율
+
+    ratio_fat = (u.total_fat * 9) / u.total_kcal if u.total_kcal > 0 else 0    # 지방 에너지 비율
+    ratio_cho = (u.total_carbs * 4) / u.total_kcal if u.total_kcal > 0 else 0  # 탄수화물 에너지 비율
+    ratio_sugar_to_cho = u.total_sugar / u.total_carbs if u.total_carbs > 0 else 0 # 탄수화물 중 당류 비율
+
+    # 2. 로그 변환 및 특성 행렬 생성
+    # 모델의 Feature 순서(FEATURES) 일치 중요
+    input_row = np.array([[
+        u.age,
+        bmi,
+        u.sex,
+        np.log1p(pct_calorie),
+        pct_protein,
+        np.log1p(pct_sodium),
+        ratio_sugar_to_cho,
+        np.log1p(ratio_fat),
+        ratio_cho,
+    ]], dtype=np.float64)
+
+    # 3. 예측 (실제 위험도)
+    # 당뇨 발병 확률 (0~1 사이 값)
+    real_risk = predict_risk(input_row)[0]
+
+    # 4. 아바타 비교 (상대평가 점수)
+    # 모델이 아바타(평균적인 위험 식습관)의 데이터로 계산한 위험도
+    avatar_risk = predict_risk(_avatar_matrix(input_row))[0]
+
+    # 아바타 위험도(avatar_risk)를 기준으로 점수를 산정
+    if avatar_risk <= 0.20:
+        score = 100
+    elif avatar_risk <= 0.53:
+        # 0.20 ~ 0.53 구간을 80 ~ 100점으로 선형 보간
+        score = 80 + ((0.53 - avatar_risk) / (0.53 - 0.20) * 20)
+    elif avatar_risk <= 0.68:
+        # 0.53 ~ 0.68 구간을 40 ~ 80점으로 선형 보간
+        score = 40 + ((0.68 - avatar_risk) / (0.68 - 0.53) * 40)
+    else:
+        # 0.68 ~ 0.91 구간을 0 ~ 40점으로 선형 보간 (0.91 초과는 0점)
+        score = ((0.91 - avatar_risk) / (0.91 - 0.68) * 40)
+
+    # 점수를 0~100 사이로 클립하고 정수로 변환
+    final_score = int(np.clip(score, 0, 100))
+    # 실제 위험도를 백분율로 변환
+    similarity = int(real_risk * 100)
+
+    return {
+        "user_id": u.user_id,
+        "score": final_score,
+        "similarity": similarity,
+        "risk_level": _risk_level(final_score)
+    }
+
+
+def _risk_level(final_score: int) -> str:
+    return "DANGER" if final_score < 50 else ("WARNING" if final_score < 80 else "GOOD")
+
+
+def _avatar_matrix(matrix: np.ndarray) -> np.ndarray:
+    # 식단 특성은 그대로 두고 나이 / BMI / 성별만 아바타 기준값으로 교체
+    avatar = matrix.copy()
+    avatar[:, FEATURES.index('AGE')] = 52
+    avatar[:, FEATURES.index('BMI')] = 26.0
+    avatar[:, FEATURES.index('SEX')] = 1
+    return avatar
+
+
+def _build_features(users: List[UserDietInfo]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    전체 사용자의 특성을 _score_user 와 같은 공식으로 열 단위 계산한다.
+    (FEATURES 순서의 행렬, 유효 여부) 를 반환하며, 0 나누기 / 음수 로그처럼 값이 유한하지 않은 행은 False.
+    """
+    age, sex, height, weight, kcal, carbs, fat, protein, sodium, sugar = (
+        np.array([getattr(u, name) for u in users], dtype=np.float64)
+        for name in ("age", "sex", "height", "weight", "total_kcal", "total_carbs",
+                     "total_fat", "total_protein", "total_sodium", "total_sugar")
+    )
+
+    def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        # 분모가 0 이하면 0 (기존 0 나누기 방어 로직과 동일)
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+    with np.errstate(all="ignore"):
+        bmi = weight / ((height / 100) ** 2)
+        rec_calorie = (height - 100) * 0.9 * np.where(sex == 1, 30, 25)
+
+        matrix = np.column_stack([
+            age,
+            bmi,
+            sex,
+            np.log1p(ratio(kcal, rec_calorie)),
+            ratio(protein, weight),
+            np.log1p(sodium / 2000.0),
+            ratio(sugar, carbs),
+            np.log1p(ratio(fat * 9, kcal)),
+            ratio(carbs * 4, kcal),
+        ])
+
+    valid = (height != 0) & np.isfinite(matrix).all(axis=1)
+    return matrix, valid
+
+
+def _map_scores(avatar_risk: np.ndarray) -> np.ndarray:
+    # 기존 코드는 numpy 스칼라와 파이썬 float 를 연산했으므로 같은 결과 dtype 으로 맞춰 계산
+    avatar_risk = avatar_risk.astype(np.result_type(avatar_risk.dtype.type(0), 0.0))
+    return np.select(
+        [avatar_risk <= 0.20, avatar_risk <= 0.53, avatar_risk <= 0.68],
+        [
+            np.full_like(avatar_risk, 100),
+            80 + ((0.53 - avatar_risk) / (0.53 - 0.20) * 20),
+            40 + ((0.68 - avatar_risk) / (0.68 - 0.53) * 40),
+        ],
+        (0.91 - avatar_risk) / (0.91 - 0.68) * 40,
+    )
+
+
+def _score_batch(users: List[UserDietInfo]) -> List[Optional[dict]]:
+    # 유효한 행은 실제 / 아바타 행렬을 predict_risk 한 번씩으로 계산하고, 나머지는 None 으로 남겨 _score_user 로 처리
+    matrix, valid = _build_features(users)
+    results: List[Optional[dict]] = [None] * len(users)
+    if not valid.any():
+        return results
+
+    real_matrix = matrix[valid]
+    real_risk = predict_risk(real_matrix)
+    avatar_risk = predict_risk(_avatar_matrix(real_matrix))
+
+    score = _map_scores(avatar_risk)
+    similarity = real_risk.astype(np.result_type(real_risk.dtype.type(0), 100)) * 100
+    ok = np.isfinite(score) & np.isfinite(similarity)
+    final_scores = np.clip(np.where(ok, score, 0), 0, 100).astype(np.int64)
+    similarities = np.where(ok, similarity, 0).astype(np.int64)
+
+    for row, index in enumerate(np.flatnonzero(valid)):
+        if not ok[row]:
+            continue
+        final_score = int(final_scores[row])
+        results[index] = {
+            "user_id": users[index].user_id,
+            "score": final_score,
+            "similarity": int(similarities[row]),
+            "risk_level": _risk_level(final_score)
+        }
+    return results
+
+
 @test.post("/api/calculate-score")
 def calculate_diet_score(users: List[UserDietInfo]):
     """
@@ -57,81 +346,22 @@ def calculate_diet_score(users: List[UserDietInfo]):
     if not users:
         return []
 
+    try:
+        batch_results = _score_batch(users)
+    except Exception as e:
+        # 배치 계산이 실패하면 사용자별 계산으로 대체
+        print(f"❌ 배치 점수 계산 실패, 사용자별로 계산합니다: {e}")
+        batch_results = [None] * len(users)
+
     results = []
 
-    for u in users:
-        try:
-            # 1. 전처리 (모델 학습 때와 동일한 공식 적용)
-            # BMI 계산
-            bmi = u.weight / ((u.height / 100) ** 2)
-
-            # 성별 권장 칼로리 (남:30, 여:25) * 표준체중
-            rec_calorie = (u.height - 100) * 0.9 * (30 if u.sex == 1 else 25)
-
-            # 비율 계산 (0 나누기 방어 로직)
-            pct_calorie = u.total_kcal / rec_calorie if rec_calorie > 0 else 0
-            pct_protein = u.total_protein / u.weight if u.weight > 0 else 0
-            pct_sodium = u.total_sodium / 2000.0 # 나트륨 권장량 2000mg 대비 비율
-
-            ratio_fat = (u.total_fat * 9) / u.total_kcal if u.total_kcal > 0 else 0    # 지방 에너지 비율
-            ratio_cho = (u.total_carbs * 4) / u.total_kcal if u.total_kcal > 0 else 0  # 탄수화물 에너지 비율
-            ratio_sugar_to_cho = u.total_sugar / u.total_carbs if u.total_carbs > 0 else 0 # 탄수화물 중 당류 비율
-
-            # 2. 로그 변환 및 DataFrame 생성
-            # 모델의 Feature 순서 및 이름 일치 중요
-            input_df = pd.DataFrame([{
-                'AGE': u.age,
-                'BMI': bmi,
-                'SEX': u.sex,
-                'LOG_PCT_CALORIE': np.log1p(pct_calorie),
-                'PCT_PROTEIN': pct_protein,
-                'LOG_PCT_SODIUM': np.log1p(pct_sodium),
-                'RATIO_SUGAR_TO_CHO': ratio_sugar_to_cho,
-                'LOG_RATIO_FAT': np.log1p(ratio_fat),
-                'RATIO_CHO': ratio_cho
-            }])
-
-            features = ['AGE', 'BMI', 'SEX', 'LOG_PCT_CALORIE', 'PCT_PROTEIN',
-                        'LOG_PCT_SODIUM', 'RATIO_SUGAR_TO_CHO', 'LOG_RATIO_FAT', 'RATIO_CHO']
-
-            # 3. 예측 (실제 위험도)
-            # 당뇨 발병 확률 (0~1 사이 값)
-            real_risk = diet_model.predict_proba(input_df[features])[:, 1][0]
-
-            # 4. 아바타 비교 (상대평가 점수)
-            # 모델이 아바타(평균적인 위험 식습관)의 데이터로 계산한 위험도
-            avatar_df = input_df.copy()
-            avatar_df['AGE'] = 52
-            avatar_df['BMI'] = 26.0
-            avatar_df['SEX'] = 1
-            avatar_risk = diet_model.predict_proba(avatar_df[features])[:, 1][0]
-
-            # 아바타 위험도(avatar_risk)를 기준으로 점수를 산정
-            if avatar_risk <= 0.20:
-                score = 100
-            elif avatar_risk <= 0.53:
-                # 0.20 ~ 0.53 구간을 80 ~ 100점으로 선형 보간
-                score = 80 + ((0.53 - avatar_risk) / (0.53 - 0.20) * 20)
-            elif avatar_risk <= 0.68:
-                # 0.53 ~ 0.68 구간을 40 ~ 80점으로 선형 보간
-                score = 40 + ((0.68 - avatar_risk) / (0.68 - 0.53) * 40)
-            else:
-                # 0.68 ~ 0.91 구간을 0 ~ 40점으로 선형 보간 (0.91 초과는 0점)
-                score = ((0.91 - avatar_risk) / (0.91 - 0.68) * 40)
-
-            # 점수를 0~100 사이로 클립하고 정수로 변환
-            final_score = int(np.clip(score, 0, 100))
-            # 실제 위험도를 백분율로 변환
-            similarity = int(real_risk * 100)
-
-            # 결과 리스트에 추가
-            results.append({
-                "user_id": u.user_id,
-                "score": final_score,
-                "similarity": similarity,
-                "risk_level": "DANGER" if final_score < 50 else ("WARNING" if final_score < 80 else "GOOD")
-            })
+    for u, result in zip(users, batch_results):
+        if result is not None:
+            results.append(result)
+            continue
 
+        try:
+            results.append(_score_user(u))
         except Exception as e:
             print(f"❌ User {u.user_id} 처리 중 오류 발생: {e}")
             # 특정 사용자 처리 중 오류가 발생하더라도 나머지 사용자는 계속 처리
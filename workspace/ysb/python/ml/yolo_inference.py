@@ -1,14 +1,85 @@
-from ml import MODEL_PATH
+from typing import Any, Dict, List, Tuple, Union
+
+from ml.backends import load_model, count_class_ids
+from saveus_common.batching import BatchInferenceEngine
+from utils.executors import detection_executors
+from utils.image_ingest import decode_image
+from utils.readiness import load_and_warm_up
 
-from six import BytesIO
-from ultralytics import YOLO
 from collections import Counter
-from PIL import Image
 
-model = YOLO(MODEL_PATH / "saveUs_food_detection.pt")
+import numpy as np
+import os
+import threading
+
+YOLO_BATCH_MAX_SIZE = int(os.getenv("YOLO_BATCH_MAX_SIZE", 8))
+
+# ultralytics 의 predictor 는 스레드 안전하지 않으므로 추론 워커(스레드)마다 자기 모델을 사용
+# (thread 모드에서 YOLO_WORKERS 개의 모델이 메모리에 올라감, process 모드는 프로세스당 하나)
+_models = threading.local()
+# 워커들이 동시에 로드할 때 onnx / openvino 변환 파일을 함께 쓰지 않도록 로드는 한 번에 하나씩
+_load_lock = threading.Lock()
+# (pid, thread id) -> 해당 추론 워커의 warm-up 측정값 (warm_up_worker 에서 기록)
+_worker_warm_ups: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+
+def get_model():
+    # import 시점이 아니라 첫 사용(또는 추론 워커 initializer) 시점에 현재 스레드의 모델을 로드
+    model = getattr(_models, "model", None)
+    if model is None:
+        with _load_lock:
+            # YOLO_BACKEND: pytorch | onnx | openvino, YOLO_INT8=1 이면 양자화 모델 사용
+            model = _models.model = load_model(
+                os.getenv("YOLO_BACKEND", "pytorch"),
+                int8=os.getenv("YOLO_INT8", "0") == "1",
+            )
+    return model
+
+
+def _warm_up_once(model) -> None:
+    # 단건 / 최대 배치 크기 두 가지 shape 로 커널 초기화
+    synthetic = np.zeros((640, 640, 3), dtype=np.uint8)
+    model.predict(synthetic, verbose=False)
+    model.predict([synthetic] * YOLO_BATCH_MAX_SIZE, verbose=False)
+
+
+def warm_up(runs: int = 1) -> Dict[str, Any]:
+    return load_and_warm_up(get_model, _warm_up_once, runs)
+
+
+def warm_up_worker(runs: int = 1) -> None:
+    # 추론 실행기의 initializer. 워커가 첫 작업을 받기 전에 모델을 로드하고 warm-up
+    _worker_warm_ups[(os.getpid(), threading.get_ident())] = warm_up(runs)
+
+
+def get_worker_warm_up() -> Dict[str, Any]:
+    pid, thread_id = os.getpid(), threading.get_ident()
+    return {"worker": f"{pid}:{thread_id}", **_worker_warm_ups[(pid, thread_id)]}
+
+
+def get_class_names() -> Dict[int, str]:
+    return dict(get_model().names)
+
+
+def predict_batch(images: List[np.ndarray]) -> List[Counter]:
+    preds = get_model().predict(images)
+
+    return [count_class_ids(pred) for pred in preds]
+
+
+batch_engine = BatchInferenceEngine(
+    predict_batch,
+    max_batch_size=YOLO_BATCH_MAX_SIZE,
+    max_wait_ms=float(os.getenv("YOLO_BATCH_MAX_WAIT_MS", 5)),
+    runner=detection_executors.run_inference,
+    max_concurrent_batches=detection_executors.inference_workers,
+)
+
 
-async def detect_objects(content: bytes) -> Counter:
-    img = Image.open(BytesIO(content))
-    pred = model.predict(img)[0]
+async def detect_objects(image: Union[bytes, np.ndarray]) -> Counter:
+    # 감지된 클래스 번호별 개수를 반환 (번호 -> 음식은 services.food_detection 의 클래스 테이블로 변환)
+    # 이미 디코딩된 BGR ndarray 는 그대로 사용 (ultralytics 는 ndarray 를 BGR 로 취급)
+    if not isinstance(image, np.ndarray):
+        image = await detection_executors.run_cpu(decode_image, image)
 
-    return Counter(p["name"] for p in pred.summary())
+    return await batch_engine.submit(image)
@@ -1,3 +1,4 @@
 from .food_nutrition import FoodNutritionRepository
+from .food_nutrition_catalog import FoodNutritionCatalog
 
-__all__ = ["FoodNutritionRepository"]
+__all__ = ["FoodNutritionRepository", "FoodNutritionCatalog"]
@@ -0,0 +1,398 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from models.food_nutrition import Food
+from repositories.food_nutrition_catalog import catalog_key
+from saveus_common.timings import percentile
+
+import asyncio
+import csv
+import os
+import sqlite3
+import time
+
+load_dotenv()
+
+FOOD_NUTRITION_FIELDS = [
+    "food_id",
+    "food_name",
+    "category",
+    "calories_kcal",
+    "carbs_g",
+    "protein_g",
+    "fat_g",
+    "sugar_g",
+    "fiber_g",
+    "sodium_mg",
+    "calcium_mg",
+]
+
+INSERT_FIELDS = FOOD_NUTRITION_FIELDS[1:]
+
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+# 커넥션을 얻기까지 / 쿼리 한 번의 최대 대기 시간 (초)
+DB_ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", 2))
+DB_QUERY_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", 5))
+
+
+class PoolStats:
+    def __init__(self, size: int, window: int = 1000) -> None:
+        self.size = size
+        self.in_use = 0
+        self.pending = 0
+        self.max_in_use = 0
+        self.acquired = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self._wait_samples: deque = deque(maxlen=window)
+
+    def on_acquire(self, wait_seconds: float, waited: bool) -> None:
+        self.acquired += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        if waited:
+            self.waited += 1
+        self._wait_samples.append(wait_seconds)
+
+    def on_release(self) -> None:
+        self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = percentile(self._wait_samples, 0.95)
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "pending": self.pending,
+            "max_in_use": self.max_in_use,
+            # 모든 커넥션이 사용 중이라 대기한 비율 (포화도)
+            "saturation": self.waited / self.acquired if self.acquired else 0.0,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "acquire_wait_p95_ms": p95 * 1000,
+        }
+
+
+class AsyncFoodNutritionRepository(ABC):
+    """
+    FoodNutritionRepository 의 asyncio 버전. 호출마다 풀에서 커넥션을 빌리고 반납한다.
+    드라이버별 차이는 _open / _close / _acquire_conn / _release_conn / _fetchall / _execute 로 분리.
+    """
+
+    table_name = "FOOD_NUTRITION"
+    paramstyle = "%s"
+
+    def __init__(
+            self,
+            pool_size: int = DB_POOL_MAX_SIZE,
+            acquire_timeout: float = DB_ACQUIRE_TIMEOUT,
+            query_timeout: float = DB_QUERY_TIMEOUT,
+    ) -> None:
+        self.fields = list(FOOD_NUTRITION_FIELDS)
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.query_timeout = query_timeout
+        self.stats = PoolStats(pool_size)
+        # 동기 저장소의 카탈로그 모드와 같은 인터페이스를 유지 (비동기 저장소는 카탈로그 없음)
+        self.catalog = None
+
+        self._opened = False
+        self._open_lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        async with self._open_lock:
+            if not self._opened:
+                await self._open()
+                self._opened = True
+
+    async def close(self) -> None:
+        if self._opened:
+            self._opened = False
+            await self._close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.stats.snapshot()
+
+    @asynccontextmanager
+    async def connection(self):
+        await self.open()
+
+        started = time.perf_counter()
+        # 이미 사용 중이거나 대기 중인 요청이 풀 크기 이상이면 이번 요청은 대기한 것으로 집계
+        waited = self.stats.in_use + self.stats.pending >= self.pool_size
+        self.stats.pending += 1
+        try:
+            conn = await asyncio.wait_for(self._acquire_conn(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.pending -= 1
+        self.stats.on_acquire(time.perf_counter() - started, waited)
+
+        broken = False
+        try:
+            yield conn
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # 쿼리 도중 취소된 커넥션은 상태를 알 수 없으므로 풀에 돌려보내지 않는다
+            self.stats.cancelled += 1
+            broken = True
+            raise
+        finally:
+            self.stats.on_release()
+            await self._release_conn(conn, broken)
+
+    async def _query(self, sql: str, params: Sequence[Any], fetch: bool = True, timeout: Optional[float] = None) -> Any:
+        sql = sql.replace("%s", self.paramstyle)
+        timeout = self.query_timeout if timeout is None else timeout
+
+        async with self.connection() as conn:
+            try:
+                if fetch:
+                    return await asyncio.wait_for(self._fetchall(conn, sql, params), timeout)
+                return await asyncio.wait_for(self._execute(conn, sql, params), timeout)
+            except asyncio.TimeoutError:
+                self.stats.timeouts += 1
+                raise
+
+    async def get_food_names(self, timeout: Optional[float] = None) -> List[str]:
+        rows = await self._query(f"SELECT FOOD_NAME FROM {self.table_name}", (), timeout=timeout)
+        return [row[0] for row in rows]
+
+    async def get_food_nutrition_by_name(self, food_name: str, timeout: Optional[float] = None) -> Optional[dict]:
+        rows = await self._query(
+            f"SELECT {', '.join(self.fields)} FROM {self.table_name} WHERE FOOD_NAME = %s LIMIT 1",
+            (food_name,),
+            timeout=timeout,
+        )
+        if not rows:
+            return None
+
+        return dict(zip(self.fields, rows[0]))
+
+    async def get_food_nutrition_by_names(
+            self,
+            food_names: Iterable[Optional[str]],
+            timeout: Optional[float] = None,
+    ) -> List[Optional[dict]]:
+        # 입력과 같은 위치에 결과를 두고, 없는 이름은 None
+        food_names = list(food_names)
+        unique_names = list(dict.fromkeys(name for name in food_names if name))
+
+        rows_by_name = {}
+        if unique_names:
+            placeholders = ", ".join(["%s"] * len(unique_names))
+            rows = await self._query(
+                f"SELECT {', '.join(self.fields)} FROM {self.table_name} WHERE FOOD_NAME IN ({placeholders})",
+                tuple(unique_names),
+                timeout=timeout,
+            )
+            for row in rows:
+                food_info = dict(zip(self.fields, row))
+                rows_by_name.setdefault(catalog_key(food_info["food_name"]), food_info)
+
+        return [rows_by_name.get(catalog_key(name)) if name else None for name in food_names]
+
+    async def get_foods_by_names(
+            self,
+            food_names: Iterable[Optional[str]],
+            timeout: Optional[float] = None,
+    ) -> List[Optional[Food]]:
+        food_infos = await self.get_food_nutrition_by_names(food_names, timeout)
+        return [Food(**food_info) if food_info is not None else None for food_info in food_infos]
+
+    async def insert_food_nutrition(self, food: dict, timeout: Optional[float] = None) -> Optional[int]:
+        placeholders = ", ".join(["%s"] * len(INSERT_FIELDS))
+        return await self._query(
+            f"INSERT INTO {self.table_name} ({', '.join(INSERT_FIELDS)}) VALUES ({placeholders})",
+            tuple(food.get(field) for field in INSERT_FIELDS),
+            fetch=False,
+            timeout=timeout,
+        )
+
+    @abstractmethod
+    async def _open(self) -> None:
+        ...
+
+    @abstractmethod
+    async def _close(self) -> None:
+        ...
+
+    @abstractmethod
+    async def _acquire_conn(self) -> Any:
+        ...
+
+    @abstractmethod
+    async def _release_conn(self, conn: Any, broken: bool) -> None:
+        ...
+
+    @abstractmethod
+    async def _fetchall(self, conn: Any, sql: str, params: Sequence[Any]) -> List[tuple]:
+        ...
+
+    @abstractmethod
+    async def _execute(self, conn: Any, sql: str, params: Sequence[Any]) -> Optional[int]:
+        ...
+
+
+class AioMySQLFoodNutritionRepository(AsyncFoodNutritionRepository):
+    def __init__(self, min_size: int = DB_POOL_MIN_SIZE, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.min_size = min(min_size, self.pool_size)
+        self._pool = None
+
+    async def _open(self) -> None:
+        import aiomysql
+
+        self._pool = await aiomysql.create_pool(
+            minsize=self.min_size,
+            maxsize=self.pool_size,
+            host=os.getenv("DB_HOST"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            db=os.getenv("DB_DATABASE"),
+            port=int(os.getenv("DB_PORT", 3306)),
+            charset="utf8",
+            autocommit=True,
+        )
+
+    async def _close(self) -> None:
+        self._pool.close()
+        await self._pool.wait_closed()
+
+    async def _acquire_conn(self) -> Any:
+        return await self._pool.acquire()
+
+    async def _release_conn(self, conn: Any, broken: bool) -> None:
+        if broken:
+            # 닫힌 커넥션은 풀이 반납 시 버린다
+            conn.close()
+        self._pool.release(conn)
+
+    async def _fetchall(self, conn: Any, sql: str, params: Sequence[Any]) -> List[tuple]:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+
+    async def _execute(self, conn: Any, sql: str, params: Sequence[Any]) -> Optional[int]:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return cursor.lastrowid
+
+
+class SQLiteFoodNutritionRepository(AsyncFoodNutritionRepository):
+    """
+    로컬 테스트 / 벤치마크용 SQLite 대체 저장소.
+    커넥션 풀은 asyncio.Queue 로, 쿼리는 스레드에서 실행해 MySQL 드라이버와 비슷한 동시성을 만든다.
+    """
+
+    paramstyle = "?"
+
+    def __init__(self, path: str = ":memory:", csv_path: Optional[str] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # :memory: 는 커넥션마다 별도 DB 이므로 공유 캐시 메모리 DB 로 바꾼다
+        self.path = f"file:food_nutrition_{id(self)}?mode=memory&cache=shared" if path == ":memory:" else path
+        self.csv_path = csv_path
+        self._idle: Optional[asyncio.Queue] = None
+        self._conns: List[sqlite3.Connection] = []
+        # 커넥션별로 스레드에서 마지막으로 실행한 쿼리 (취소 시 끝날 때까지 반납을 미룸)
+        self._running: Dict[sqlite3.Connection, asyncio.Future] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, uri=self.path.startswith("file:"), check_same_thread=False, isolation_level=None)
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                food_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                food_name TEXT NOT NULL COLLATE NOCASE,
+                category TEXT,
+                calories_kcal REAL,
+                carbs_g REAL,
+                protein_g REAL,
+                fat_g REAL,
+                sugar_g REAL,
+                fiber_g REAL,
+                sodium_mg REAL,
+                calcium_mg REAL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_food_name ON {self.table_name} (food_name)")
+
+        if self.csv_path and conn.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0] == 0:
+            with open(self.csv_path, encoding="utf-8") as f:
+                rows = [
+                    tuple(row.get(field) or None for field in INSERT_FIELDS)
+                    for row in csv.DictReader(f)
+                ]
+            placeholders = ", ".join(["?"] * len(INSERT_FIELDS))
+            conn.executemany(
+                f"INSERT INTO {self.table_name} ({', '.join(INSERT_FIELDS)}) VALUES ({placeholders})",
+                rows,
+            )
+
+    async def _open(self) -> None:
+        def connect_all() -> List[sqlite3.Connection]:
+            conns = [self._connect() for _ in range(self.pool_size)]
+            self._init_schema(conns[0])
+            return conns
+
+        self._conns = await asyncio.to_thread(connect_all)
+        self._idle = asyncio.Queue()
+        for conn in self._conns:
+            self._idle.put_nowait(conn)
+
+    async def _close(self) -> None:
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+
+    async def _acquire_conn(self) -> Any:
+        return await self._idle.get()
+
+    async def _release_conn(self, conn: Any, broken: bool) -> None:
+        future = self._running.pop(conn, None)
+        if broken and future is not None and not future.done():
+            # 스레드에서 실행 중인 쿼리를 중단시키고, 스레드가 끝난 뒤에 반납
+            conn.interrupt()
+            future.add_done_callback(lambda f: self._release_interrupted(conn, f))
+            return
+        # 쿼리가 이미 끝났거나 시작되기 전에 취소된 경우는 바로 반납
+        self._release_interrupted(conn, future)
+
+    async def _run(self, conn: sqlite3.Connection, fn, *args: Any) -> Any:
+        future = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+        self._running[conn] = future
+        return await asyncio.shield(future)
+
+    def _release_interrupted(self, conn: sqlite3.Connection, future: Optional[asyncio.Future]) -> None:
+        # 취소된 호출의 예외는 이미 호출자에게 취소로 전달됨
+        if future is not None and future.done() and not future.cancelled():
+            future.exception()
+        self._idle.put_nowait(conn)
+
+    async def _fetchall(self, conn: Any, sql: str, params: Sequence[Any]) -> List[tuple]:
+        return await self._run(conn, lambda: conn.execute(sql, params).fetchall())
+
+    async def _execute(self, conn: Any, sql: str, params: Sequence[Any]) -> Optional[int]:
+        return await self._run(conn, lambda: conn.execute(sql, params).lastrowid)
+
+
+def create_async_food_nutrition_repository(backend: str) -> AsyncFoodNutritionRepository:
+    if backend == "aiomysql":
+        return AioMySQLFoodNutritionRepository()
+    if backend == "sqlite":
+        default_csv = Path(__file__).resolve().parents[3] / "ljr" / "food_nutrition.csv"
+        return SQLiteFoodNutritionRepository(
+            path=os.getenv("FOOD_NUTRITION_SQLITE_PATH", ":memory:"),
+            csv_path=os.getenv("FOOD_NUTRITION_SQLITE_CSV", str(default_csv)),
+        )
+    raise ValueError(f"unknown FOOD_NUTRITION_BACKEND: {backend}")
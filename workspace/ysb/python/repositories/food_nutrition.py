@@ -1,26 +1,35 @@
-from typing import Optional
+from typing import Optional, List, Tuple, Iterable
 from models.food_nutrition import Food
-from repositories.connections import get_connection
+from repositories.connections import connection_pool, get_connection
+from repositories.food_nutrition_catalog import FoodNutritionCatalog, catalog_key
+
+import os
+
+# 1 이면 시작 시 FOOD_NUTRITION 전체를 메모리에 올리고 조회는 메모리에서 처리
+FOOD_NUTRITION_CATALOG = os.getenv("FOOD_NUTRITION_CATALOG", "0") == "1"
 
 
 class FoodNutritionLoadError(Exception): pass
 
 class FoodNutritionRepository:
-    def __init__(self):
-        self._conn = get_connection()
+    # 커넥션은 호출마다 풀에서 빌리고 반납 (여러 IO 스레드에서 동시에 호출 가능)
+    def __init__(self, use_catalog: bool = FOOD_NUTRITION_CATALOG):
         self.table_name = "FOOD_NUTRITION"
         self._load_fields()
 
         if self.fields is None:
             raise Exception
 
-    def __del__(self):
-        self._conn.close()
+        self.catalog: Optional[FoodNutritionCatalog] = None
+        if use_catalog:
+            self.catalog = FoodNutritionCatalog(self.fields)
+            self.refresh(full=True)
 
     def _load_fields(self) -> None:
-        cursor = None
+        conn = cursor = None
         try:
-            cursor = self._conn.cursor()
+            conn = get_connection()
+            cursor = conn.cursor()
             cursor.execute(f"DESCRIBE {self.table_name}")
             self.fields = [row[0].lower() for row in cursor.fetchall()]
         except Exception as e:
@@ -29,10 +38,66 @@ class FoodNutritionRepository:
         finally:
             if cursor:
                 cursor.close()
+            if conn:
+                conn.close()
+
+    def refresh(self, full: bool = False) -> int:
+        # 다른 프로세스가 추가한 행을 반영. full 이 아니면 마지막 FOOD_ID 이후 행만 읽는다
+        # (다른 프로세스가 기존 행을 UPDATE 한 경우는 full 로만 반영됨, services.nutrition_import 참고)
+        if self.catalog is None:
+            return 0
+
+        conn = cursor = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            if full:
+                cursor.execute(f"SELECT * FROM {self.table_name} ORDER BY FOOD_ID")
+            else:
+                cursor.execute(
+                    f"SELECT * FROM {self.table_name} WHERE FOOD_ID > %s ORDER BY FOOD_ID",
+                    (self.catalog.max_food_id,),
+                )
+            rows = cursor.fetchall()
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+        if full:
+            self.catalog.load(rows)
+        else:
+            for row in rows:
+                self.catalog.upsert(row)
+
+        return len(rows)
+
+    def get_food_names(self) -> List[str]:
+        # 음식명 인덱스(utils.name_index) 구성용
+        if self.catalog is not None:
+            return self.catalog.food_names
+
+        conn = cursor = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT FOOD_NAME FROM {self.table_name}")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
 
     def get_food_nutrition_by_name(self, food_name: str) -> Optional[dict]:
+        if self.catalog is not None:
+            return self.catalog.get_row(food_name)
+
+        conn = cursor = None
         try:
-            cursor = self._conn.cursor()
+            conn = get_connection()
+            cursor = conn.cursor()
             sql = f"""
             SELECT * FROM {self.table_name}
             WHERE FOOD_NAME = %s
@@ -48,10 +113,123 @@ class FoodNutritionRepository:
         finally:
             if cursor:
                 cursor.close()
+            if conn:
+                conn.close()
+
+    def get_food_nutrition_by_names(self, food_names: Iterable[Optional[str]]) -> List[Optional[dict]]:
+        # 여러 음식명을 한 번의 IN 쿼리로 조회. 입력과 같은 위치에 결과를 두고, 없는 이름은 None
+        food_names = list(food_names)
+        if self.catalog is not None:
+            return [self.catalog.get_row(name) for name in food_names]
+
+        unique_names = list(dict.fromkeys(name for name in food_names if name))
+
+        rows_by_name = {}
+        if unique_names:
+            conn = cursor = None
+            try:
+                conn = get_connection()
+                cursor = conn.cursor()
+                placeholders = ", ".join(["%s"] * len(unique_names))
+                sql = f"""
+                SELECT * FROM {self.table_name}
+                WHERE FOOD_NAME IN ({placeholders})
+                        """
+
+                cursor.execute(sql, tuple(unique_names))
+                for row in cursor.fetchall():
+                    food_info = dict(zip(self.fields, row))
+                    rows_by_name.setdefault(catalog_key(food_info["food_name"]), food_info)
+            finally:
+                if cursor:
+                    cursor.close()
+                if conn:
+                    conn.close()
+
+        return [rows_by_name.get(catalog_key(name)) if name else None for name in food_names]
+
+    def open(self) -> None:
+        # 비동기 저장소와 같은 인터페이스. 커넥션은 처음 사용할 때 풀에서 연결한다
+        pass
+
+    def close(self) -> None:
+        connection_pool.close()
+
+    def pool_stats(self) -> dict:
+        return connection_pool.stats()
+
+    def get_foods_by_names(self, food_names: Iterable[Optional[str]]) -> List[Optional[Food]]:
+        # 카탈로그 모드에서는 미리 만들어 둔 Food 객체를 그대로 반환
+        if self.catalog is not None:
+            return self.catalog.get_foods(food_names)
+
+        return [
+            Food(**food_info) if food_info is not None else None
+            for food_info in self.get_food_nutrition_by_names(food_names)
+        ]
+
+    def upsert_food_nutrition_many(self, foods: List[dict], batch_size: int = 500) -> Tuple[int, int]:
+        # 일괄 적재용. 이미 있는 이름은 UPDATE, 없는 이름은 INSERT 를 각각 executemany 로 처리
+        # 반환값은 (추가된 행 수, 갱신된 행 수)
+        columns = ["category", "calories_kcal", "carbs_g", "protein_g", "fat_g",
+                   "sugar_g", "fiber_g", "sodium_mg", "calcium_mg"]
+        insert_sql = f"""
+            INSERT INTO {self.table_name} (food_name, {", ".join(columns)})
+            VALUES (%(food_name)s, {", ".join(f"%({column})s" for column in columns)})
+        """
+        update_sql = f"""
+            UPDATE {self.table_name}
+            SET {", ".join(f"{column} = %({column})s" for column in columns)}
+            WHERE FOOD_NAME = %(food_name)s
+        """
+
+        inserted = updated = 0
+        conn = cursor = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            for start in range(0, len(foods), batch_size):
+                batch = foods[start:start + batch_size]
+                placeholders = ", ".join(["%s"] * len(batch))
+                cursor.execute(
+                    f"SELECT FOOD_NAME FROM {self.table_name} WHERE FOOD_NAME IN ({placeholders})",
+                    tuple(food["food_name"] for food in batch),
+                )
+                existing = {catalog_key(row[0]) for row in cursor.fetchall()}
+
+                to_update = [food for food in batch if catalog_key(food["food_name"]) in existing]
+                to_insert = [food for food in batch if catalog_key(food["food_name"]) not in existing]
+
+                if to_update:
+                    cursor.executemany(update_sql, to_update)
+                    updated += len(to_update)
+                if to_insert:
+                    cursor.executemany(insert_sql, to_insert)
+                    inserted += len(to_insert)
+                conn.commit()
+
+                # write-through: 갱신 / 추가한 행을 카탈로그에도 반영 (FOOD_ID 는 DB 에서 다시 읽음)
+                if self.catalog is not None:
+                    cursor.execute(
+                        f"SELECT * FROM {self.table_name} WHERE FOOD_NAME IN ({placeholders})",
+                        tuple(food["food_name"] for food in batch),
+                    )
+                    for row in cursor.fetchall():
+                        self.catalog.upsert(row)
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+        return inserted, updated
 
     def insert_food_nutrition(self, food: Food) -> None:
+        conn = cursor = None
         try:
-            cursor = self._conn.cursor()
+            conn = get_connection()
+            cursor = conn.cursor()
 
             sql = f"""
                 INSERT INTO {self.table_name} (
@@ -79,7 +257,14 @@ class FoodNutritionRepository:
                 )
             """
             cursor.execute(sql, food)
-            self._conn.commit()
+            conn.commit()
+
+            # write-through: 방금 추가한 행을 카탈로그에도 반영
+            if self.catalog is not None:
+                food_info = {**food, "food_id": cursor.lastrowid}
+                self.catalog.upsert(tuple(food_info.get(field) for field in self.fields))
         finally:
             if cursor:
                 cursor.close()
+            if conn:
+                conn.close()
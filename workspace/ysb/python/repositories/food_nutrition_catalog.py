@@ -0,0 +1,83 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models.food_nutrition import Food
+
+import threading
+
+
+def catalog_key(food_name: str) -> str:
+    # MySQL collation 과 같이 대소문자 / 끝 공백 차이는 같은 이름으로 취급
+    return food_name.casefold().rstrip()
+
+
+class FoodNutritionCatalog:
+    """
+    FOOD_NUTRITION 전체를 메모리에 올려 두는 읽기용 카탈로그.
+    행은 tuple 배열, 이름 -> 행 번호 인덱스, 행 번호별 Food 객체로 보관한다.
+    """
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = list(fields)
+        self._id_pos = self.fields.index("food_id")
+        self._name_pos = self.fields.index("food_name")
+
+        # (행 배열, Food 배열, 이름 인덱스) 를 하나의 tuple 로 보관해 교체 시에도 일관되게 읽히도록 함
+        self._state: Tuple[List[tuple], List[Food], Dict[str, int]] = ([], [], {})
+        self._lock = threading.Lock()
+
+        self.max_food_id = 0
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    @property
+    def food_names(self) -> List[str]:
+        return [row[self._name_pos] for row in self._state[0]]
+
+    def load(self, rows: Iterable[Sequence]) -> None:
+        catalog_rows: List[tuple] = []
+        foods: List[Food] = []
+        index: Dict[str, int] = {}
+        max_food_id = 0
+
+        for row in rows:
+            row = tuple(row)
+            index.setdefault(catalog_key(row[self._name_pos]), len(catalog_rows))
+            catalog_rows.append(row)
+            foods.append(Food(**dict(zip(self.fields, row))))
+            max_food_id = max(max_food_id, row[self._id_pos] or 0)
+
+        # 읽는 쪽은 잠금 없이 접근하므로 완성된 구조를 한 번에 교체
+        with self._lock:
+            self._state = (catalog_rows, foods, index)
+            self.max_food_id = max_food_id
+
+    def upsert(self, row: Sequence) -> None:
+        row = tuple(row)
+        key = catalog_key(row[self._name_pos])
+        food = Food(**dict(zip(self.fields, row)))
+
+        with self._lock:
+            rows, foods, index = self._state
+            if (pos := index.get(key)) is not None and rows[pos][self._id_pos] == row[self._id_pos]:
+                rows[pos] = row
+                foods[pos] = food
+            else:
+                rows.append(row)
+                foods.append(food)
+                index.setdefault(key, len(rows) - 1)
+            self.max_food_id = max(self.max_food_id, row[self._id_pos] or 0)
+
+    def get_row(self, food_name: Optional[str]) -> Optional[dict]:
+        rows, _, index = self._state
+        if not food_name or (pos := index.get(catalog_key(food_name))) is None:
+            return None
+        return dict(zip(self.fields, rows[pos]))
+
+    def get_foods(self, food_names: Iterable[Optional[str]]) -> List[Optional[Food]]:
+        # 입력과 같은 위치에 Food, 없는 이름은 None
+        _, foods, index = self._state
+        return [
+            foods[pos] if name and (pos := index.get(catalog_key(name))) is not None else None
+            for name in food_names
+        ]
@@ -0,0 +1,153 @@
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+
+import copy
+import hashlib
+import os
+import time
+
+import cv2
+import numpy as np
+
+CACHE_MODES = ("off", "sha256", "phash")
+
+
+def copy_items(items: Any) -> list:
+    # Food(BaseModel) / dict 항목까지 복사해 호출한 쪽이 결과를 수정해도 캐시 항목은 바뀌지 않도록 함
+    # (항목의 필드는 숫자 / 문자열이라 항목 단위 얕은 복사로 충분)
+    return [copy.copy(item) for item in items]
+
+
+def perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    # dHash: 1/8 축소 흑백 디코딩 후 9x8 로 줄여 인접 픽셀 밝기 차이를 64bit 로 만든다
+    buf = np.frombuffer(image_bytes, dtype=np.uint8)
+    gray = cv2.imdecode(buf, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if gray is None:
+        return None
+
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class DetectionResultCache:
+    """
+    이미지 바이트 해시를 키로 detect_food 결과를 저장하는 LRU 캐시.
+    phash 모드에서는 해시가 다르더라도 perceptual hash 거리가 phash_distance 이하면 적중으로 본다.
+    """
+
+    def __init__(
+            self,
+            mode: str = "sha256",
+            max_entries: int = 1024,
+            max_bytes: int = 16 * 1024 * 1024,
+            ttl: float = 600.0,
+            phash_distance: int = 4,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"unknown DETECTION_CACHE_MODE: {mode}")
+
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.phash_distance = phash_distance
+
+        # sha256 -> (저장 시각, phash, 크기 추정치, 결과)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[int], int, Any]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def make_key(self, image_bytes: bytes) -> Tuple[str, Optional[int]]:
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        phash = perceptual_hash(image_bytes) if self.mode == "phash" else None
+        return digest, phash
+
+    def get(self, key: Tuple[str, Optional[int]]) -> Optional[Any]:
+        digest, phash = key
+        now = time.monotonic()
+
+        entry = self._entries.get(digest)
+        if entry is not None and now - entry[0] > self.ttl:
+            self._remove(digest)
+            entry = None
+
+        if entry is None and phash is not None:
+            digest = self._find_near(phash, now)
+            entry = self._entries.get(digest) if digest else None
+            if entry is not None:
+                self.near_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(digest)
+        return copy_items(entry[3])
+
+    def put(self, key: Tuple[str, Optional[int]], value: Any) -> None:
+        digest, phash = key
+        size = len(repr(value)) + 256
+
+        if digest in self._entries:
+            self._remove(digest)
+
+        if size > self.max_bytes:
+            return
+
+        self._entries[digest] = (time.monotonic(), phash, size, copy_items(value))
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _find_near(self, phash: int, now: float) -> Optional[str]:
+        best, best_distance = None, self.phash_distance + 1
+        for digest, (stored_at, other, _, _) in self._entries.items():
+            if other is None or now - stored_at > self.ttl:
+                continue
+            distance = bin(phash ^ other).count("1")
+            if distance < best_distance:
+                best, best_distance = digest, distance
+        return best
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+detection_cache = DetectionResultCache(
+    mode=os.getenv("DETECTION_CACHE_MODE", "sha256"),
+    max_entries=int(os.getenv("DETECTION_CACHE_MAX_ENTRIES", 1024)),
+    max_bytes=int(float(os.getenv("DETECTION_CACHE_MAX_MB", 16)) * 1024 * 1024),
+    ttl=float(os.getenv("DETECTION_CACHE_TTL_SEC", 600)),
+    phash_distance=int(os.getenv("DETECTION_CACHE_PHASH_DISTANCE", 4)),
+)
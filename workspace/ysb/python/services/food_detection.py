@@ -1,32 +1,179 @@
 from typing import Optional, List
 
 from repositories import FoodNutritionRepository
+from repositories.async_food_nutrition import create_async_food_nutrition_repository
 from api import FoodNutritionClient, ProductInfoClient
 from utils.barcode_detector import BarcodeDetector
-from ml.yolo_inference import detect_objects
+from ml.yolo_inference import detect_objects, get_class_names
 from models.food_nutrition import Food
 from utils.mapper import label_map
+from utils.executors import detection_executors
+from utils.image_ingest import decode_image
+from saveus_common.timings import TimingStats
+from utils.name_index import FoodNameIndex
+from utils.single_flight import SingleFlight
+from services.detection_cache import detection_cache
 
 import asyncio
+import inspect
+import os
 
-food_nutrition_repository = FoodNutritionRepository()
+IMAGE_MAX_SIDE = int(os.getenv("IMAGE_MAX_SIDE", 1920))
+# 1 이면 바코드 인식과 YOLO 추론을 동시에 시작
+DETECTION_SPECULATIVE = os.getenv("DETECTION_SPECULATIVE", "0") == "1"
+
+detection_timings = TimingStats()
+
+# mysql: 동기 mysql.connector 저장소 (IO 실행기에서 실행), aiomysql / sqlite: asyncio 저장소
+FOOD_NUTRITION_BACKEND = os.getenv("FOOD_NUTRITION_BACKEND", "mysql")
+
+if FOOD_NUTRITION_BACKEND == "mysql":
+    food_nutrition_repository = FoodNutritionRepository()
+else:
+    food_nutrition_repository = create_async_food_nutrition_repository(FOOD_NUTRITION_BACKEND)
+
+barcode_detector = BarcodeDetector(
+    max_width=IMAGE_MAX_SIDE,
+    max_height=IMAGE_MAX_SIDE,
+    localize=os.getenv("BARCODE_LOCALIZE", "1") == "1",
+    full_frame_fallback=os.getenv("BARCODE_FULL_FRAME_FALLBACK", "0") == "1",
+)
+# YOLO 클래스 번호로 바로 Food 를 찾는 배열 (모델 로드 후 load_class_table 로 생성)
+class_table: Optional[List[Optional[Food]]] = None
+_class_table_lock = asyncio.Lock()
+
+# 바코드 상품명이 DB 이름과 조금 달라도 외부 API 를 호출하지 않도록 하는 음식명 인덱스
+food_name_index = FoodNameIndex()
+
+# 바코드 / 품목번호(ITEM_REPORT_NO) 별로 동시에 진행 중인 외부 조회와 DB insert 를 하나로 합침
+barcode_flight = SingleFlight()
+report_no_flight = SingleFlight()
 
-barcode_detector = BarcodeDetector()
 product_info_client = ProductInfoClient()
 food_nutrition_client = FoodNutritionClient()
 
+async def _call_repository(method, *args):
+    # 비동기 저장소는 루프에서 바로 await, 동기 저장소는 IO 실행기에서 실행
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await detection_executors.run_io(method, *args)
+
+
+async def open_repository() -> None:
+    await _call_repository(food_nutrition_repository.open)
+
+
+async def close_repository() -> None:
+    await _call_repository(food_nutrition_repository.close)
+
+
+async def load_class_table() -> List[Optional[Food]]:
+    """
+    YOLO 클래스 번호 -> label_map -> 영양정보를 한 번에 풀어 클래스 번호로 인덱싱한 배열을 만든다.
+    label_map 에 없거나 DB 에 영양정보가 없는 클래스는 None 으로 두고 경고를 출력한다.
+    """
+    global class_table
+
+    class_names = await detection_executors.run_inference(get_class_names)
+    labels = [label_map.get(class_names[class_id]) for class_id in range(len(class_names))]
+
+    # 결과는 labels 와 같은 순서 (클래스 번호 순) 로 반환됨
+    table = await _call_repository(food_nutrition_repository.get_foods_by_names, labels)
+
+    if unmapped := [class_names[class_id] for class_id, label in enumerate(labels) if label is None]:
+        print(f"class table: {len(unmapped)} classes not in label_map: {unmapped}")
+    if missing := sorted({label for label, food in zip(labels, table) if label is not None and food is None}):
+        print(f"class table: {len(missing)} labels without nutrition: {missing}")
+
+    class_table = table
+    return table
+
+
+async def get_class_table() -> List[Optional[Food]]:
+    if class_table is None:
+        async with _class_table_lock:
+            if class_table is None:
+                await load_class_table()
+    return class_table
+
+
+async def load_food_name_index() -> None:
+    food_names = await _call_repository(food_nutrition_repository.get_food_names)
+    await detection_executors.run_cpu(food_name_index.load, food_names)
+
+
 async def detect_food(imageBytes) -> Optional[List[Food]]:
-    detected_barcode = barcode_detector.detect_codes_from_file(imageBytes)
+    if not detection_cache.enabled:
+        return await _detect_food(imageBytes)
+
+    cache_key = await detection_executors.run_cpu(detection_cache.make_key, imageBytes)
+    if (cached := detection_cache.get(cache_key)) is not None:
+        return cached
+
+    nutrition_items = await _detect_food(imageBytes)
+    if nutrition_items is not None:
+        detection_cache.put(cache_key, nutrition_items)
+
+    return nutrition_items
+
 
-    if not detected_barcode:
-        detected_foods = await detect_objects(imageBytes)
-        items = [label_map.get(res) for res in detected_foods]
-        nutrition_items = [Food(**food_info) for item in items if (food_info := food_nutrition_repository.get_food_nutrition_by_name(item))]
+async def _detect_food(imageBytes) -> Optional[List[Food]]:
+    # 한 번 디코딩한 ndarray 를 바코드/YOLO 단계가 함께 사용
+    image = await detection_timings.timed(
+        "decode", detection_executors.run_cpu(decode_image, imageBytes, IMAGE_MAX_SIDE, IMAGE_MAX_SIDE)
+    )
+    barcode_branch = detection_timings.timed(
+        "barcode", detection_executors.run_cpu(barcode_detector.detect_codes_from_array, image)
+    )
 
-        return nutrition_items
+    if not DETECTION_SPECULATIVE:
+        detected_barcode = await barcode_branch
 
-    barcode = detected_barcode[0]
+        if not detected_barcode:
+            detected_foods = await detection_timings.timed("yolo", detect_objects(image))
+            return await _lookup_detected_foods(detected_foods)
 
+        return await _lookup_barcode(detected_barcode[0])
+
+    # 바코드 인식과 YOLO 를 동시에 시작하고, 바코드가 나오면 YOLO 결과는 버린다
+    yolo_task = asyncio.ensure_future(detection_timings.timed("yolo", detect_objects(image)))
+    try:
+        detected_barcode = await barcode_branch
+    except BaseException:
+        _discard_task(yolo_task)
+        raise
+
+    if detected_barcode:
+        _discard_task(yolo_task)
+        detection_timings.incr("yolo_discarded")
+        return await _lookup_barcode(detected_barcode[0])
+
+    return await _lookup_detected_foods(await yolo_task)
+
+
+def _discard_task(task: asyncio.Future):
+    # 이미 예외로 끝난 작업도 예외를 읽어 두어야 "Task exception was never retrieved" 로그가 남지 않는다
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _lookup_detected_foods(detected_class_ids) -> List[Food]:
+    # 요청마다 문자열 변환 / DB 조회 없이 클래스 번호로 바로 Food 를 찾는다
+    table = await get_class_table()
+    nutrition_items = [food for class_id in detected_class_ids if (food := table[class_id]) is not None]
+
+    if unresolved := len(detected_class_ids) - len(nutrition_items):
+        detection_timings.incr("nutrition_miss", unresolved)
+
+    return nutrition_items
+
+
+async def _lookup_barcode(barcode: str) -> Optional[List[Food]]:
+    # 같은 바코드를 동시에 조회하는 요청은 한 번의 조회 결과를 공유
+    return await barcode_flight.do(barcode, lambda: _resolve_barcode(barcode))
+
+
+async def _resolve_barcode(barcode: str) -> Optional[List[Food]]:
     barcode_fetch_result = await product_info_client.get_prd_report_no(barcode)
 
     if barcode_fetch_result is None:
@@ -35,13 +182,43 @@ async def detect_food(imageBytes) -> Optional[List[Food]]:
     food_name, prd_no = barcode_fetch_result
     food_name = food_name.replace(" ", "")
 
-    if (nutrition_item := food_nutrition_repository.get_food_nutrition_by_name(food_name)) is None:
-        nutrition_item = await food_nutrition_client.get_food_data(
-            query_params={
-                "ITEM_REPORT_NO": prd_no,
-            }
-        )
-        nutrition_item["food_name"] = food_name.replace(" ", "")
-        food_nutrition_repository.insert_food_nutrition(nutrition_item)
+    if (nutrition_item := await _find_nutrition_by_name(food_name)) is None:
+        # 다른 바코드가 같은 품목번호를 가리킬 수 있으므로 품목번호 기준으로 한 번 더 합친다
+        nutrition_item = await report_no_flight.do(prd_no, lambda: _fetch_and_store_nutrition(prd_no, food_name))
+
+    if nutrition_item is None:
+        return
 
     return [nutrition_item]
+
+
+async def _find_nutrition_by_name(food_name: str) -> Optional[dict]:
+    nutrition_item = await _call_repository(food_nutrition_repository.get_food_nutrition_by_name, food_name)
+
+    # 이름이 정확히 일치하지 않으면 정규화 / 유사도 인덱스로 DB 에 있는 이름을 찾아 다시 조회
+    if nutrition_item is None and (matched := food_name_index.lookup(food_name)) is not None:
+        nutrition_item = await _call_repository(food_nutrition_repository.get_food_nutrition_by_name, matched[0])
+        if nutrition_item is not None:
+            detection_timings.incr("external_calls_saved")
+
+    return nutrition_item
+
+
+async def _fetch_and_store_nutrition(prd_no: str, food_name: str) -> Optional[dict]:
+    # 앞선 요청이 방금 추가했을 수 있으므로 외부 API 호출 전에 다시 확인
+    if (nutrition_item := await _call_repository(food_nutrition_repository.get_food_nutrition_by_name, food_name)) is not None:
+        return nutrition_item
+
+    nutrition_item = await food_nutrition_client.get_food_data(
+        query_params={
+            "ITEM_REPORT_NO": prd_no,
+        }
+    )
+    if nutrition_item is None:
+        return
+
+    nutrition_item["food_name"] = food_name
+    await _call_repository(food_nutrition_repository.insert_food_nutrition, nutrition_item)
+    food_name_index.add(nutrition_item["food_name"])
+
+    return nutrition_item
@@ -0,0 +1,217 @@
+"""
+식품영양성분 DB(getFoodNtrCpntDbInq02) 전체를 페이지 단위로 받아 FOOD_NUTRITION 에 미리 적재한다.
+받은 페이지는 spool 디렉터리에 저장하므로 중단 후 다시 실행하면 남은 페이지만 받는다.
+모든 페이지를 받은 뒤 전체에서 음식명별 최신 UPDATE_DATE 행만 남겨 DB 에 쓰고 spool 을 비운다.
+
+    python -m services.nutrition_import --concurrency 4
+    python -m services.nutrition_import --base-url http://127.0.0.1:8765/api --dry-run   # benchmarks.nutrition_api_stub
+"""
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from api.food_nutrition_client import FoodNutritionClient
+from api.http_pool import http_pool
+from utils import DATA_DIR
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import time
+
+# 받은 페이지를 저장하는 디렉터리 (기본 DATA_DIR/nutrition_import_spool)
+NUTRITION_IMPORT_SPOOL = os.getenv("NUTRITION_IMPORT_SPOOL", str(DATA_DIR / "nutrition_import_spool"))
+
+
+class ImportSpool:
+    """
+    받은 페이지의 원본 행을 페이지별 JSON 파일로 저장 (= 재시작 checkpoint).
+    페이지 크기나 전체 건수가 바뀌면 처음부터 다시 받는다. persist 가 False 면 메모리에만 보관 (dry run).
+    """
+
+    def __init__(self, path: str, page_size: int, persist: bool = True) -> None:
+        self.path = path
+        self.page_size = page_size
+        self.persist = persist
+        self.done: Set[int] = set()
+        self._pages: Dict[int, List[Dict[str, Any]]] = {}
+
+    def _page_path(self, page_no: int) -> str:
+        return os.path.join(self.path, f"page_{page_no:06d}.json")
+
+    def _write(self, path: str, data: Any) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        # 쓰는 도중 중단돼도 반쯤 쓴 파일이 남지 않도록 교체
+        os.replace(tmp_path, path)
+
+    def load(self, total_count: int) -> None:
+        if not self.persist:
+            return
+
+        meta = {"page_size": self.page_size, "total_count": total_count}
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved != meta:
+                print(f"spool 무시: page_size / total_count 가 달라짐 ({saved.get('page_size')}, {saved.get('total_count')})")
+                self.clear()
+
+        os.makedirs(self.path, exist_ok=True)
+        self._write(meta_path, meta)
+        for name in os.listdir(self.path):
+            if name.startswith("page_") and name.endswith(".json"):
+                self.done.add(int(name[len("page_"):-len(".json")]))
+
+    def save(self, page_no: int, items: List[Dict[str, Any]]) -> None:
+        if self.persist:
+            self._write(self._page_path(page_no), items)
+        else:
+            self._pages[page_no] = items
+        self.done.add(page_no)
+
+    def items(self) -> Iterator[Dict[str, Any]]:
+        for page_no in sorted(self.done):
+            if not self.persist:
+                yield from self._pages[page_no]
+                continue
+            with open(self._page_path(page_no), encoding="utf-8") as f:
+                yield from json.load(f)
+
+    def clear(self) -> None:
+        self.done.clear()
+        self._pages.clear()
+        if self.persist and os.path.exists(self.path):
+            shutil.rmtree(self.path)
+
+
+def to_food_rows(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    API 응답 행들을 FoodNutritionClient._to_food_data 와 같은 규칙으로 한 번에 변환한다.
+    (숫자로 바꿀 수 없는 값은 0, 같은 음식명은 UPDATE_DATE 가 가장 최신인 행만 남김)
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(items)
+    if frame.empty or "FOOD_NM_KR" not in frame:
+        return []
+
+    if "UPDATE_DATE" in frame:
+        frame = frame.sort_values("UPDATE_DATE", ascending=False, kind="stable")
+    # DB 조회와 같이 대소문자 / 끝 공백 차이는 같은 음식으로 취급
+    frame = frame[frame["FOOD_NM_KR"].notna() & (frame["FOOD_NM_KR"].astype(str).str.strip() != "")]
+    frame = frame.loc[~frame["FOOD_NM_KR"].astype(str).str.casefold().str.rstrip().duplicated()]
+
+    columns: Dict[str, Any] = {}
+    for raw_key, field_name in FoodNutritionClient.FIELD_MAP.items():
+        target_type = FoodNutritionClient.FIELD_TYPE_MAP[field_name]
+        raw = frame[raw_key] if raw_key in frame else pd.Series(None, index=frame.index, dtype=object)
+
+        if target_type in (int, Optional[int]):
+            columns[field_name] = pd.to_numeric(raw, errors="coerce").fillna(0).astype("int64")
+        elif target_type in (float, Optional[float]):
+            columns[field_name] = pd.to_numeric(raw, errors="coerce").fillna(0.).astype("float64")
+        else:
+            columns[field_name] = raw.astype(object).where(raw.notna(), None)
+
+    # to_dict 는 numpy 값을 파이썬 int / float 로 바꿔서 반환 (DB 드라이버에 그대로 전달 가능)
+    return pd.DataFrame(columns).to_dict("records")
+
+
+async def run_import(
+        base_url: str,
+        page_size: int,
+        concurrency: int,
+        spool_path: str,
+        dry_run: bool = False,
+        batch_size: int = 500,
+) -> int:
+    client = FoodNutritionClient(base_url=base_url)
+
+    first = await client.fetch_page(1, page_size)
+    if first is None:
+        print("error occurred: 첫 페이지 조회 실패")
+        return 1
+
+    total_count = int(first.get("totalCount", 0))
+    total_pages = math.ceil(total_count / page_size)
+
+    # dry run 은 받은 페이지를 파일에 남기지 않으므로 이후 실제 적재에 영향이 없음
+    spool = ImportSpool(spool_path, page_size, persist=not dry_run)
+    spool.load(total_count)
+    pages = [page_no for page_no in range(1, total_pages + 1) if page_no not in spool.done]
+    print(f"total_count={total_count} pages={total_pages} remaining={len(pages)}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failed: List[int] = []
+
+    async def fetch_page(page_no: int) -> None:
+        async with semaphore:
+            body = first if page_no == 1 else await client.fetch_page(page_no, page_size)
+        if body is None:
+            failed.append(page_no)
+            return
+
+        await asyncio.to_thread(spool.save, page_no, body.get("items", []))
+        done = len(spool.done)
+        if done % 50 == 0 or done == total_pages:
+            print(f"{done}/{total_pages} pages")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetch_page(page_no) for page_no in pages))
+
+    if failed:
+        # 음식명별 최신 행은 전체 페이지를 받은 뒤에만 정할 수 있으므로 DB 에 쓰지 않음
+        print(f"failed_pages={sorted(failed)}")
+        print("실패한 페이지가 있습니다. 같은 명령을 다시 실행하면 남은 페이지만 받습니다.")
+        return 1
+
+    foods = await asyncio.to_thread(lambda: to_food_rows(list(spool.items())))
+
+    inserted = updated = 0
+    if not dry_run:
+        # DB 설정(.env) 이 필요하므로 실제 적재할 때만 생성
+        from repositories.food_nutrition import FoodNutritionRepository
+        repository = FoodNutritionRepository(use_catalog=False)
+        inserted, updated = await asyncio.to_thread(repository.upsert_food_nutrition_many, foods, batch_size)
+        spool.clear()
+        if updated:
+            # 실행 중인 서버의 카탈로그는 새 FOOD_ID 만 주기적으로 읽으므로 갱신된 행은 전체 다시 읽기가 필요
+            print("갱신된 행을 서버 카탈로그에 반영하려면 POST /food/nutrition/refresh?full=true 를 호출하세요.")
+
+    elapsed = time.perf_counter() - started
+    print(f"rows={len(foods)} inserted={inserted} updated={updated} elapsed_s={elapsed:.1f}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default=FoodNutritionClient.BASE_URL)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--spool", default=NUTRITION_IMPORT_SPOOL)
+    parser.add_argument("--reset", action="store_true", help="spool 을 지우고 처음부터 받기")
+    parser.add_argument("--dry-run", action="store_true", help="DB 에 쓰지 않고 조회 / 변환만 수행")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.spool):
+        shutil.rmtree(args.spool)
+
+    async def run() -> int:
+        await http_pool.open()
+        try:
+            return await run_import(
+                args.base_url, args.page_size, args.concurrency, args.spool, args.dry_run, args.batch_size,
+            )
+        finally:
+            await http_pool.close()
+
+    raise SystemExit(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
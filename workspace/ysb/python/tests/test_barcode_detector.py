@@ -0,0 +1,43 @@
+from unittest import mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)  # zbar 공유 라이브러리가 없을 때도 건너뜀
+
+from utils.barcode_detector import BarcodeDetector
+
+
+def blank_image(value: int = 180) -> "np.ndarray":
+    return np.full((720, 960, 3), value, dtype=np.uint8)
+
+
+def test_blank_image_skips_cascade():
+    detector = BarcodeDetector()
+
+    with mock.patch.object(detector, "_decode_cascade", wraps=detector._decode_cascade) as cascade:
+        assert detector.detect_codes_from_array(blank_image()) == []
+
+    cascade.assert_not_called()
+
+
+def test_full_frame_fallback_is_opt_in():
+    detector = BarcodeDetector(full_frame_fallback=True)
+
+    with mock.patch.object(detector, "_decode_cascade", return_value=[]) as cascade:
+        assert detector.detect_codes_from_array(blank_image()) == []
+
+    cascade.assert_called_once()
+
+
+def test_failed_regions_fall_back_to_full_frame():
+    detector = BarcodeDetector()
+    image = blank_image()
+
+    with mock.patch.object(detector, "_find_candidate_regions", return_value=[(10, 10, 100, 50)]), \
+            mock.patch.object(detector, "_decode_cascade", side_effect=[[], ["8801234567893"]]) as cascade:
+        assert detector.detect_codes_from_array(image) == ["8801234567893"]
+
+    assert cascade.call_count == 2
+    assert cascade.call_args_list[-1].args[0] is image
@@ -1,3 +1,7 @@
 from pathlib import Path
 
-PATH = Path(__file__).parent
\ No newline at end of file
+import os
+
+PATH = Path(__file__).parent
+# 실행 중에 만들어지는 파일(외부 API 조회 캐시 등)을 두는 디렉터리. 기본값은 실행 경로가 아닌 ysb/python/data
+DATA_DIR = Path(os.getenv("DATA_DIR", PATH.parent / "data"))
@@ -21,6 +21,12 @@ class BarcodeDetector:
         symbols: Optional[Sequence[ZBarSymbol]] = None,
         max_width: int = 1920,
         max_height: int = 1920,
+        cascade: bool = True,
+        localize: bool = True,
+        gradient_threshold: int = 200,
+        min_region_ratio: float = 0.002,
+        max_regions: int = 3,
+        full_frame_fallback: bool = False,
     ) -> None:
         if symbols is None:
             symbols = (
@@ -35,6 +41,12 @@ class BarcodeDetector:
         self._symbols: Tuple[ZBarSymbol, ...] = tuple(symbols)
         self._max_width = int(max_width)
         self._max_height = int(max_height)
+        self._cascade = cascade
+        self._localize = localize
+        self._gradient_threshold = int(gradient_threshold)
+        self._min_region_ratio = float(min_region_ratio)
+        self._max_regions = int(max_regions)
+        self._full_frame_fallback = full_frame_fallback
 
     def detect_codes_from_file(
         self,
@@ -45,15 +57,91 @@ class BarcodeDetector:
         return self.detect_codes_from_array(img_array)
 
     def detect_codes_from_array(self, image: np.ndarray) -> List[str]:
-        preprocessed = self._preprocess(image)
+        if not self._cascade:
+            preprocessed = self._preprocess(image)
+
+            decoded_raw = []
+            decoded_raw.extend(self._decode(image, note="original_bgr"))
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            decoded_raw.extend(self._decode(gray, note="gray"))
+            decoded_raw.extend(self._decode(preprocessed, note="preprocessed"))
+
+            return self._normalize_results(decoded_raw)
+
+        if not self._localize:
+            return self._decode_cascade(image)
 
-        decoded_raw = []
-        decoded_raw.extend(self._decode(image, note="original_bgr"))
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        decoded_raw.extend(self._decode(gray, note="gray"))
-        decoded_raw.extend(self._decode(preprocessed, note="preprocessed"))
+        regions = self._find_candidate_regions(gray)
+
+        # 바코드 형태의 영역이 없으면 디코딩을 건너뜀
+        # (gradient 검사에 걸리지 않는 QR 코드 등도 찾으려면 full_frame_fallback 으로 전체 이미지 디코딩)
+        if not regions:
+            return self._decode_cascade(image) if self._full_frame_fallback else []
+
+        for x, y, w, h in regions:
+            codes = self._decode_cascade(image[y:y + h, x:x + w])
+            if codes:
+                return codes
+
+        # 후보 영역에서 인식하지 못하면 (영역이 잘렸거나 일부만 잡힌 경우) 전체 이미지로 디코딩
+        return self._decode_cascade(image)
+
+    def _decode_cascade(self, image: np.ndarray) -> List[str]:
+        # 앞 단계에서 인식되면 이후 단계(흑백, 전처리)는 계산하지 않음
+        stages = (
+            ("original_bgr", lambda: image),
+            ("gray", lambda: cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)),
+            ("preprocessed", lambda: self._preprocess(image)),
+        )
+
+        for note, build in stages:
+            decoded_raw = self._decode(build(), note=note)
+            if decoded_raw:
+                return self._normalize_results(decoded_raw)
+
+        return []
 
-        return self._normalize_results(decoded_raw)
+    def _find_candidate_regions(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        h, w = gray.shape[:2]
+        scale = min(640.0 / max(h, w), 1.0)
+        small = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+
+        # 한 방향으로만 강한 gradient (막대 패턴) 를 강조
+        grad_x = cv2.convertScaleAbs(cv2.Sobel(small, ddepth=cv2.CV_32F, dx=1, dy=0, ksize=-1))
+        grad_y = cv2.convertScaleAbs(cv2.Sobel(small, ddepth=cv2.CV_32F, dx=0, dy=1, ksize=-1))
+        gradient = cv2.blur(cv2.absdiff(grad_x, grad_y), (9, 9))
+
+        _, thresh = cv2.threshold(gradient, self._gradient_threshold, 255, cv2.THRESH_BINARY)
+        if not cv2.countNonZero(thresh):
+            return []
+
+        closed = cv2.bitwise_or(
+            cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (21, 7))),
+            cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (7, 21))),
+        )
+        closed = cv2.erode(closed, None, iterations=4)
+        closed = cv2.dilate(closed, None, iterations=4)
+
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self._min_region_ratio * small.shape[0] * small.shape[1]
+        contours = sorted(
+            (c for c in contours if cv2.contourArea(c) >= min_area),
+            key=cv2.contourArea,
+            reverse=True,
+        )[:self._max_regions]
+
+        regions = []
+        for contour in contours:
+            x, y, rw, rh = cv2.boundingRect(contour)
+            pad_x, pad_y = int(rw * 0.1) + 4, int(rh * 0.1) + 4
+            x0 = max(int((x - pad_x) / scale), 0)
+            y0 = max(int((y - pad_y) / scale), 0)
+            x1 = min(int((x + rw + pad_x) / scale), w)
+            y1 = min(int((y + rh + pad_y) / scale), h)
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+
+        return regions
 
     def _load_image(
         self,
@@ -0,0 +1,102 @@
+from typing import Any, Callable, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+import asyncio
+import os
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+class DetectionExecutors:
+    """
+    detect_food 의 CPU/IO 작업을 이벤트 루프 밖에서 실행하기 위한 실행기 묶음.
+    - cpu: OpenCV / pyzbar (바코드 인식)
+    - io: 동기 MySQL 조회
+    - inference: YOLO 추론 (thread 또는 process, inline 은 기존과 같이 루프에서 직접 실행)
+      thread 모드에서도 워커 스레드마다 모델을 따로 로드하므로 YOLO_WORKERS 만큼 메모리를 더 사용한다.
+    """
+
+    def __init__(self) -> None:
+        self._cpu: Optional[Executor] = None
+        self._io: Optional[Executor] = None
+        self._inference: Optional[Executor] = None
+        # 추론 워커가 시작될 때 한 번 실행할 함수 (set_inference_initializer)
+        self._inference_initializer: Optional[Callable] = None
+        self._inference_initargs: Tuple[Any, ...] = ()
+        self.configure()
+
+    def configure(
+            self,
+            mode: Optional[str] = None,
+            inference_mode: Optional[str] = None,
+            cpu_workers: Optional[int] = None,
+            io_workers: Optional[int] = None,
+            inference_workers: Optional[int] = None,
+    ) -> None:
+        self.shutdown()
+
+        self.mode = mode or os.getenv("DETECTION_EXECUTOR", "thread")
+        self.inference_mode = inference_mode or os.getenv("YOLO_EXECUTOR", self.mode)
+
+        if self.mode not in ("inline", "thread"):
+            raise ValueError(f"unknown DETECTION_EXECUTOR: {self.mode}")
+        if self.inference_mode not in EXECUTOR_MODES:
+            raise ValueError(f"unknown YOLO_EXECUTOR: {self.inference_mode}")
+
+        self.cpu_workers = cpu_workers or int(os.getenv("DETECTION_CPU_WORKERS", min(4, os.cpu_count() or 1)))
+        # FoodNutritionRepository 는 호출마다 풀에서 커넥션을 빌리므로 기본값은 DB 풀 크기
+        self.io_workers = io_workers or int(os.getenv("DETECTION_IO_WORKERS", os.getenv("DB_POOL_SIZE", 5)))
+        self.inference_workers = inference_workers or int(os.getenv("YOLO_WORKERS", 1))
+
+        if self.mode == "thread":
+            self._cpu = ThreadPoolExecutor(self.cpu_workers, thread_name_prefix="detect-cpu")
+            self._io = ThreadPoolExecutor(self.io_workers, thread_name_prefix="detect-io")
+
+        self._inference = self._make_inference_executor()
+
+    def _make_inference_executor(self) -> Optional[Executor]:
+        initializer, initargs = self._inference_initializer, self._inference_initargs
+        if self.inference_mode == "thread":
+            return ThreadPoolExecutor(
+                self.inference_workers, thread_name_prefix="detect-yolo", initializer=initializer, initargs=initargs,
+            )
+        if self.inference_mode == "process":
+            return ProcessPoolExecutor(self.inference_workers, initializer=initializer, initargs=initargs)
+        return None
+
+    def set_inference_initializer(self, initializer: Callable, *initargs: Any) -> None:
+        """
+        추론 워커(스레드 / 프로세스)마다 첫 작업 전에 한 번 실행할 함수를 지정하고 추론 실행기를 새로 만든다.
+        작업 제출만으로는 워커마다 한 번씩 실행된다는 보장이 없으므로 모델 warm-up 은 여기서 한다.
+        """
+        self._inference_initializer = initializer
+        self._inference_initargs = initargs
+        if self._inference is not None:
+            self._inference.shutdown(wait=False, cancel_futures=True)
+        self._inference = self._make_inference_executor()
+
+    def shutdown(self) -> None:
+        for executor in (self._cpu, self._io, self._inference):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._cpu = self._io = self._inference = None
+
+    async def _run(self, executor: Optional[Executor], fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if executor is None:
+            return fn(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+    async def run_cpu(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self._cpu, fn, *args, **kwargs)
+
+    async def run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self._io, fn, *args, **kwargs)
+
+    async def run_inference(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self._inference, fn, *args, **kwargs)
+
+
+detection_executors = DetectionExecutors()
@@ -0,0 +1,45 @@
+from typing import Union
+
+import cv2
+import numpy as np
+
+from saveus_common.image_ingest import read_image_size
+from utils.barcode_detector import ImageLoadError
+
+REDUCED_COLOR_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def decode_image(
+        content: Union[bytes, bytearray, memoryview],
+        max_width: int = 1920,
+        max_height: int = 1920,
+) -> np.ndarray:
+    """
+    업로드 이미지를 한 번만 디코딩해 BGR ndarray 로 반환한다.
+    큰 JPEG 는 max 크기 이상을 유지하는 범위에서 1/2, 1/4, 1/8 축소 디코딩을 사용한다.
+    """
+    flag = cv2.IMREAD_COLOR
+    info = read_image_size(content)
+
+    if info is not None and info[0] == "jpeg":
+        _, width, height = info
+        for factor, reduced_flag in REDUCED_COLOR_FLAGS:
+            if width // factor >= max_width or height // factor >= max_height:
+                flag = reduced_flag
+                break
+
+    buf = np.frombuffer(content, dtype=np.uint8)
+    image = cv2.imdecode(buf, flag)
+    if image is None:
+        raise ImageLoadError()
+
+    h, w = image.shape[:2]
+    scale = min(max_width / float(w), max_height / float(h), 1.0)
+    if scale < 1.0:
+        image = cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+    return image
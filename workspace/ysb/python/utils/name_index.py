@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter
+
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# 이 값 이상 비슷한 이름만 같은 음식으로 취급 (jamo bigram Dice 계수, 0~1)
+FOOD_NAME_MATCH_THRESHOLD = float(os.getenv("FOOD_NAME_MATCH_THRESHOLD", 0.8))
+
+# 공백, 괄호, csv_cleansing.convert_name 이 바꾸기 전의 구분자(_) 등은 비교에서 제외
+_IGNORED_CHARS = re.compile(r"[\s()\[\]{}<>_\-·.,/]+")
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+
+def normalize_food_name(name: str) -> str:
+    # NFKC 로 전각/반각 문자를 통일한 뒤 대소문자와 무시할 문자 차이를 제거
+    return _IGNORED_CHARS.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+def to_jamo(text: str) -> str:
+    # 한글 음절을 초성/중성/종성 단위로 분해 (받침 하나 차이 같은 오타도 부분 일치하도록)
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            result.append(chr(0x1100 + offset // 588))
+            result.append(chr(0x1161 + (offset % 588) // 28))
+            if offset % 28:
+                result.append(chr(0x11A7 + offset % 28))
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def jamo_bigrams(key: str) -> Set[str]:
+    jamo = to_jamo(key)
+    if len(jamo) < 2:
+        return {jamo} if jamo else set()
+    return {jamo[i:i + 2] for i in range(len(jamo) - 1)}
+
+
+class FoodNameIndex:
+    """
+    영양정보 음식명에 대한 메모리 인덱스.
+    정규화한 이름의 정확 일치를 먼저 찾고, 없으면 jamo bigram 역색인으로 가장 비슷한 이름을 찾는다.
+    """
+
+    def __init__(self, threshold: float = FOOD_NAME_MATCH_THRESHOLD) -> None:
+        self.threshold = threshold
+
+        # (정규화 이름 -> 원래 이름, 원래 이름 배열, bigram 집합 배열, bigram -> 이름 번호 목록)
+        self._state: Tuple[Dict[str, str], List[str], List[Set[str]], Dict[str, List[int]]] = ({}, [], [], {})
+        self._lock = threading.Lock()
+
+        self.counters: Dict[str, int] = {"exact": 0, "fuzzy": 0, "miss": 0}
+        self._lookup_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def load(self, food_names: Iterable[str]) -> None:
+        exact: Dict[str, str] = {}
+        names: List[str] = []
+        grams: List[Set[str]] = []
+        postings: Dict[str, List[int]] = {}
+
+        for name in food_names:
+            if not name or (key := normalize_food_name(name)) in exact:
+                continue
+            exact[key] = name
+            self._append(name, key, names, grams, postings)
+
+        with self._lock:
+            self._state = (exact, names, grams, postings)
+
+    def add(self, food_name: str) -> None:
+        key = normalize_food_name(food_name)
+        with self._lock:
+            exact, names, grams, postings = self._state
+            if key and key not in exact:
+                exact[key] = food_name
+                self._append(food_name, key, names, grams, postings)
+
+    @staticmethod
+    def _append(name: str, key: str, names: List[str], grams: List[Set[str]], postings: Dict[str, List[int]]) -> None:
+        bigrams = jamo_bigrams(key)
+        for gram in bigrams:
+            postings.setdefault(gram, []).append(len(names))
+        names.append(name)
+        grams.append(bigrams)
+
+    def lookup(self, food_name: Optional[str]) -> Optional[Tuple[str, float]]:
+        """가장 비슷한 음식명과 유사도를 반환. 임계값 미만이면 None."""
+        if not food_name:
+            return None
+
+        started = time.perf_counter()
+        try:
+            exact, names, grams, postings = self._state
+            key = normalize_food_name(food_name)
+
+            if (name := exact.get(key)) is not None:
+                self.counters["exact"] += 1
+                return name, 1.0
+
+            query = jamo_bigrams(key)
+            shared = Counter()
+            for gram in query:
+                shared.update(postings.get(gram, ()))
+
+            best: Optional[Tuple[str, float]] = None
+            for pos, count in shared.items():
+                score = 2 * count / (len(query) + len(grams[pos]))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = names[pos], score
+
+            self.counters["fuzzy" if best else "miss"] += 1
+            return best
+        finally:
+            self._lookup_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, float]:
+        lookups = sum(self.counters.values())
+        return {
+            "size": len(self),
+            **self.counters,
+            "mean_lookup_us": self._lookup_seconds / lookups * 1_000_000 if lookups else 0.0,
+        }
@@ -0,0 +1,40 @@
+from typing import Any, Callable, Dict
+
+import time
+
+
+class ReadinessRegistry:
+    def __init__(self) -> None:
+        self.models: Dict[str, Dict[str, Any]] = {}
+
+    def pending(self, name: str) -> None:
+        self.models[name] = {"state": "loading"}
+
+    def record(self, name: str, **timings: Any) -> None:
+        self.models[name] = {"state": "ready", **timings}
+
+    def fail(self, name: str, exc: Exception) -> None:
+        self.models[name] = {"state": "failed", "error": str(exc)}
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.models) and all(m["state"] == "ready" for m in self.models.values())
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "models": self.models}
+
+
+def load_and_warm_up(load: Callable[[], Any], warm_up: Callable[[Any], Any], runs: int = 1) -> Dict[str, Any]:
+    started = time.perf_counter()
+    model = load()
+    load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        warm_up(model)
+    warmup_ms = (time.perf_counter() - started) * 1000
+
+    return {"load_ms": load_ms, "warmup_ms": warmup_ms, "warmup_runs": runs}
+
+
+readiness = ReadinessRegistry()
@@ -0,0 +1,42 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    같은 key 로 동시에 들어온 호출은 먼저 시작된 하나의 작업 결과를 함께 기다린다.
+    작업은 별도 task 로 실행되므로 먼저 호출한 쪽이 취소돼도 나머지 호출은 결과를 받는다.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        if (task := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.leaders += 1
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 기다리던 호출이 모두 취소된 경우에도 예외가 "never retrieved" 로 남지 않도록
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }